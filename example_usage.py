@@ -3,6 +3,7 @@
 Example usage of the enhanced Swoop Delivery simulation system.
 This script demonstrates how to run simulations with different configurations.
 """
+from dataclasses import replace
 
 from src.simulation_engine import SimulationEngine
 from src.simulation_config import SimulationConfig, SimulationPresets, DispatcherStrategy
@@ -115,6 +116,33 @@ def example_4_custom_analysis():
     print(f"- On-time wait: {kpis['on_time_wait_pct']:.1f}%")
 
 
+def example_5_parameter_sweep():
+    """Example 5: Sweep order volume while reusing a single engine."""
+    print("\n" + "="*60)
+    print("Example 5: Order Volume Sweep")
+    print("="*60)
+    
+    base_config = SimulationConfig(
+        simulation_duration_minutes=60,
+        order_generation_interval_min=4.0,
+        enable_detailed_logging=False
+    )
+    sweep = [replace(base_config, order_volume_multiplier=m) for m in (1.0, 1.5, 2.0)]
+    
+    # Reset the same engine for each configuration instead of rebuilding it
+    engine = SimulationEngine(base_config)
+    results = []
+    for config in sweep:
+        engine.reset(config)
+        summary = engine.run()
+        results.append((config.order_volume_multiplier, summary.calculate_kpis()))
+    
+    print(f"\nSweep Results:")
+    for multiplier, kpis in results:
+        print(f"- {multiplier:.1f}x volume: {kpis['avg_delivery_time_min']:.1f} min avg delivery, "
+              f"{kpis['avg_asset_utilization_pct']:.1f}% utilization")
+
+
 def main():
     """Run all examples."""
     print("Swoop Delivery Simulation Examples")
@@ -125,6 +153,7 @@ def main():
     example_2_strategy_test()
     example_3_rush_hour()
     example_4_custom_analysis()
+    example_5_parameter_sweep()
     
     print("\n" + "="*60)
     print("All examples completed!")
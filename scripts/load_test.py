@@ -5,17 +5,34 @@ Simulates high volume of concurrent orders to test system performance
 """
 import asyncio
 import aiohttp
+import math
 import time
 import random
-import statistics
+import sys
+from array import array
+import numpy as np
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
 import argparse
 
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    json_loads = json.loads
+
 # Configuration
 API_BASE_URL = "http://localhost:8000"
-GOLF_HOLES = list(range(1, 19))
+JSON_HEADERS = {"Content-Type": "application/json"}
+GOLF_HOLES = tuple(range(1, 19))
+MENU = (
+    "Beer", "Soda", "Water", "Hot Dog", "Burger",
+    "Chips", "Candy Bar", "Golf Balls"
+)
 
 # Test scenarios
 SCENARIOS = {
@@ -39,183 +56,458 @@ SCENARIOS = {
     }
 }
 
+# Number of samples kept for percentile estimates
+RESERVOIR_SIZE = 10000
+LOG_BATCH_SIZE = 256
+
+class ResponseTimeStats:
+    """Streaming response time statistics with bounded memory
+    
+    Mean and variance use Welford's online recurrence; percentiles are
+    estimated from a fixed-size reservoir sample.
+    """
+    
+    def __init__(self, reservoir_size: int = RESERVOIR_SIZE):
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._m2 = 0.0
+        self._reservoir_size = reservoir_size
+        self._reservoir = array('d')
+    
+    def add(self, value: float):
+        """Record a single response time"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        
+        # Reservoir sampling keeps a uniform sample of everything seen so far
+        if len(self._reservoir) < self._reservoir_size:
+            self._reservoir.append(value)
+        else:
+            j = random.randrange(self.count)
+            if j < self._reservoir_size:
+                self._reservoir[j] = value
+    
+    def merge(self, other: "ResponseTimeStats"):
+        """Combine another accumulator into this one"""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            self._reservoir = array('d', other._reservoir[:self._reservoir_size])
+            return
+        
+        # Chan et al. pairwise update for mean and sum of squared deviations
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        
+        # Draw from each reservoir in proportion to the samples it represents
+        if len(self._reservoir) + len(other._reservoir) <= self._reservoir_size:
+            self._reservoir.extend(other._reservoir)
+        else:
+            take_other = round(self._reservoir_size * other.count / count)
+            take_other = max(self._reservoir_size - len(self._reservoir), min(take_other, len(other._reservoir)))
+            take_self = self._reservoir_size - take_other
+            self._reservoir = array(
+                'd',
+                random.sample(list(self._reservoir), take_self) + random.sample(list(other._reservoir), take_other)
+            )
+        self.count = count
+    
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation"""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+    
+    def percentiles(self, q: List[float]) -> np.ndarray:
+        """Estimate percentiles from the reservoir sample"""
+        return np.percentile(np.frombuffer(self._reservoir, dtype=np.float64), q)
+    
+    def __len__(self) -> int:
+        return self.count
+
+def new_metrics() -> Dict[str, Any]:
+    """Create an empty metrics record"""
+    return {
+        "orders_created": 0,
+        "orders_dispatched": 0,
+        "orders_failed": 0,
+        "response_times": ResponseTimeStats(),
+        "batch_response_times": [],
+        "errors": []
+    }
+
 class LoadTester:
     """Load testing for Golf Course Delivery System"""
     
-    def __init__(self, scenario: str = "normal"):
+    def __init__(self, scenario: str = "normal", bulk: bool = False):
         self.scenario = SCENARIOS.get(scenario, SCENARIOS["normal"])
-        self.metrics = {
-            "orders_created": 0,
-            "orders_dispatched": 0,
-            "orders_failed": 0,
-            "response_times": [],
-            "errors": []
-        }
+        self.bulk = bulk
+        self.metrics = new_metrics()
         self.start_time = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._log_queue: Optional[asyncio.Queue] = None
+        self._log_task: Optional[asyncio.Task] = None
+        self._ts_cache = (0, "")
         
     def log(self, message: str, level: str = "INFO"):
         """Log messages with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] [{level}] {message}")
+        # Timestamps have second resolution, so format at most once per second
+        second = int(time.time())
+        if second != self._ts_cache[0]:
+            self._ts_cache = (second, datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S"))
+        line = f"[{self._ts_cache[1]}] [{level}] {message}"
+        if self._log_queue is None:
+            print(line)
+        else:
+            self._log_queue.put_nowait(line)
+    
+    def start_log_writer(self):
+        """Route log lines through a background writer while the test runs"""
+        self._log_queue = asyncio.Queue()
+        self._log_task = asyncio.create_task(self._log_writer())
+    
+    async def stop_log_writer(self):
+        """Flush any queued log lines and stop the background writer"""
+        if self._log_task is None:
+            return
+        self._log_queue.put_nowait(None)
+        await self._log_task
+        self._log_queue = None
+        self._log_task = None
+    
+    async def _log_writer(self):
+        """Drain queued log lines in batches, one stdout write per batch"""
+        queue = self._log_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < LOG_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            # None is the shutdown sentinel and is always the last item queued
+            done = batch[-1] is None
+            if done:
+                batch.pop()
+            if batch:
+                sys.stdout.write("\n".join(batch) + "\n")
+            if done:
+                return
         
-    async def create_order(self, session: aiohttp.ClientSession, user_id: int) -> Dict[str, Any]:
-        """Create a single order"""
-        hole = random.choice(GOLF_HOLES)
-        items = random.sample([
-            "Beer", "Soda", "Water", "Hot Dog", "Burger", 
-            "Chips", "Candy Bar", "Golf Balls"
-        ], k=random.randint(1, 3))
-        
-        order_data = {
-            "hole_number": hole,
+    def build_order_data(self, user_id: int) -> Dict[str, Any]:
+        """Build a random order payload"""
+        # Items are drawn with replacement, which is fine for load-test payloads
+        items = random.choices(MENU, k=random.randint(1, 3))
+        
+        return {
+            "hole_number": random.choice(GOLF_HOLES),
             "items": items,
             "special_instructions": f"Test order from user {user_id}"
         }
         
+    async def create_order(self, user_id: int, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a single order"""
+        order_data = self.build_order_data(user_id)
+        
         start = time.time()
         try:
-            async with session.post(
+            async with self.session.post(
                 f"{API_BASE_URL}/api/orders",
-                json=order_data
+                data=json_dumps(order_data),
+                headers=JSON_HEADERS
             ) as response:
                 elapsed = time.time() - start
-                self.metrics["response_times"].append(elapsed)
+                metrics["response_times"].add(elapsed)
                 
                 if response.status == 200:
-                    order = await response.json()
-                    self.metrics["orders_created"] += 1
+                    order = json_loads(await response.read())
+                    metrics["orders_created"] += 1
                     return {
                         "order_id": order["order_id"],
                         "created_at": time.time(),
                         "response_time": elapsed
                     }
                 else:
-                    self.metrics["orders_failed"] += 1
-                    self.metrics["errors"].append(f"Order creation failed: {response.status}")
+                    metrics["orders_failed"] += 1
+                    metrics["errors"].append(f"Order creation failed: {response.status}")
                     return None
                     
         except Exception as e:
-            self.metrics["orders_failed"] += 1
-            self.metrics["errors"].append(f"Order creation error: {str(e)}")
+            metrics["orders_failed"] += 1
+            metrics["errors"].append(f"Order creation error: {str(e)}")
             return None
     
-    async def dispatch_order(self, session: aiohttp.ClientSession, order_id: str) -> bool:
+    async def dispatch_order(self, order_id: str, metrics: Dict[str, Any]) -> bool:
         """Dispatch an order"""
         start = time.time()
         try:
-            async with session.post(
+            async with self.session.post(
                 f"{API_BASE_URL}/api/orders/{order_id}/dispatch"
             ) as response:
                 elapsed = time.time() - start
-                self.metrics["response_times"].append(elapsed)
+                metrics["response_times"].add(elapsed)
                 
                 if response.status == 200:
-                    self.metrics["orders_dispatched"] += 1
+                    metrics["orders_dispatched"] += 1
                     return True
                 else:
-                    self.metrics["errors"].append(f"Dispatch failed for {order_id}: {response.status}")
+                    metrics["errors"].append(f"Dispatch failed for {order_id}: {response.status}")
                     return False
                     
         except Exception as e:
-            self.metrics["errors"].append(f"Dispatch error for {order_id}: {str(e)}")
+            metrics["errors"].append(f"Dispatch error for {order_id}: {str(e)}")
             return False
     
-    async def simulate_user(self, user_id: int):
-        """Simulate a single user creating orders"""
-        async with aiohttp.ClientSession() as session:
-            orders_created = []
-            
-            for i in range(self.scenario["orders_per_user"]):
-                # Create order
-                order = await self.create_order(session, user_id)
+    async def create_orders_bulk(self, user_id: int, n: int, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Create n orders with a single request to the bulk endpoint"""
+        orders_data = [self.build_order_data(user_id) for _ in range(n)]
+        
+        start = time.time()
+        try:
+            async with self.session.post(
+                f"{API_BASE_URL}/api/orders/bulk",
+                data=json_dumps(orders_data),
+                headers=JSON_HEADERS
+            ) as response:
+                elapsed = time.time() - start
+                metrics["batch_response_times"].append(elapsed)
                 
-                if order:
-                    orders_created.append(order)
-                    self.log(f"User {user_id} created order {order['order_id']}")
-                    
-                    # Wait a bit then dispatch
-                    await asyncio.sleep(random.uniform(1, 3))
+                if response.status == 200:
+                    orders = json_loads(await response.read())
+                    metrics["orders_created"] += len(orders)
+                    created_at = time.time()
+                    return [
+                        {
+                            "order_id": order["order_id"],
+                            "created_at": created_at,
+                            "response_time": elapsed / len(orders)
+                        }
+                        for order in orders
+                    ]
+                else:
+                    metrics["orders_failed"] += n
+                    metrics["errors"].append(f"Bulk order creation failed: {response.status}")
+                    return []
                     
-                    # Dispatch the order
-                    dispatched = await self.dispatch_order(session, order["order_id"])
-                    if dispatched:
-                        self.log(f"User {user_id} order {order['order_id']} dispatched")
+        except Exception as e:
+            metrics["orders_failed"] += n
+            metrics["errors"].append(f"Bulk order creation error: {str(e)}")
+            return []
+    
+    async def dispatch_orders_bulk(self, order_ids: List[str], metrics: Dict[str, Any]) -> int:
+        """Dispatch several orders with a single request, returning how many were dispatched"""
+        start = time.time()
+        try:
+            async with self.session.post(
+                f"{API_BASE_URL}/api/orders/dispatch",
+                data=json_dumps({"order_ids": order_ids}),
+                headers=JSON_HEADERS
+            ) as response:
+                elapsed = time.time() - start
+                metrics["batch_response_times"].append(elapsed)
                 
-                # Delay between orders
-                if i < self.scenario["orders_per_user"] - 1:
-                    delay = random.uniform(*self.scenario["delay_between_orders"])
-                    await asyncio.sleep(delay)
+                if response.status == 200:
+                    dispatched = len(json_loads(await response.read()))
+                    metrics["orders_dispatched"] += dispatched
+                    if dispatched < len(order_ids):
+                        metrics["errors"].append(
+                            f"Bulk dispatch left {len(order_ids) - dispatched} of {len(order_ids)} orders undispatched"
+                        )
+                    return dispatched
+                else:
+                    metrics["errors"].append(f"Bulk dispatch failed: {response.status}")
+                    return 0
+                    
+        except Exception as e:
+            metrics["errors"].append(f"Bulk dispatch error: {str(e)}")
+            return 0
+    
+    async def create_order_at(self, user_id: int, submit_at: float, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Wait until the scheduled loop time, then create an order"""
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(max(0.0, submit_at - loop.time()))
+        return await self.create_order(user_id, metrics)
+    
+    async def simulate_user_bulk(self, user_id: int, metrics: Dict[str, Any]):
+        """Simulate a single user submitting all of their orders in one batch"""
+        orders_created = await self.create_orders_bulk(
+            user_id, self.scenario["orders_per_user"], metrics
+        )
+        
+        if orders_created:
+            order_ids = [order["order_id"] for order in orders_created]
+            self.log(f"User {user_id} created orders {', '.join(order_ids)}")
             
+            # Wait a bit then dispatch the whole batch
+            await asyncio.sleep(random.uniform(1, 3))
+            
+            dispatched = await self.dispatch_orders_bulk(order_ids, metrics)
+            self.log(f"User {user_id} dispatched {dispatched}/{len(order_ids)} orders")
+        
+        return orders_created
+    
+    async def simulate_user(self, user_id: int, metrics: Dict[str, Any]):
+        """Simulate a single user creating orders, recording into the user's own metrics"""
+        if self.bulk:
+            return await self.simulate_user_bulk(user_id, metrics)
+        
+        # Schedule every submit time up front from cumulative inter-order delays,
+        # so a slow response never pushes back the orders that follow it
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        delays = np.random.uniform(
+            *self.scenario["delay_between_orders"], self.scenario["orders_per_user"]
+        )
+        delays[:1] = 0.0  # The first order goes out immediately; delays fall between orders
+        submit_offsets = np.cumsum(delays)
+        orders = await asyncio.gather(*[
+            self.create_order_at(user_id, start + offset, metrics)
+            for offset in submit_offsets.tolist()
+        ])
+        orders_created = [order for order in orders if order]
+        
+        for order in orders_created:
+            self.log(f"User {user_id} created order {order['order_id']}")
+        
+        if not orders_created:
             return orders_created
+        
+        # Wait a bit then dispatch all orders concurrently
+        await asyncio.sleep(random.uniform(1, 3))
+        
+        results = await asyncio.gather(*[
+            self.dispatch_order(order["order_id"], metrics)
+            for order in orders_created
+        ])
+        for order, dispatched in zip(orders_created, results):
+            if dispatched:
+                self.log(f"User {user_id} order {order['order_id']} dispatched")
+        
+        return orders_created
     
     async def run_load_test(self):
         """Run the load test"""
+        self.start_log_writer()
         self.log(f"Starting load test: {self.scenario['name']}")
         self.log(f"Concurrent users: {self.scenario['concurrent_users']}")
         self.log(f"Orders per user: {self.scenario['orders_per_user']}")
         
         self.start_time = time.time()
         
-        # Create tasks for all users
-        tasks = []
-        for user_id in range(self.scenario["concurrent_users"]):
-            task = asyncio.create_task(self.simulate_user(user_id))
-            tasks.append(task)
+        # One shared session so keep-alive connections are reused across all users
+        pool_size = self.scenario["concurrent_users"] * 4
+        connector = aiohttp.TCPConnector(
+            limit=pool_size,
+            limit_per_host=pool_size,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+        
+        # Each user records into its own metrics; they are reduced once at the end
+        user_metrics = [new_metrics() for _ in range(self.scenario["concurrent_users"])]
+        
+        try:
+            async with self.session:
+                # Create tasks for all users
+                tasks = []
+                for user_id in range(self.scenario["concurrent_users"]):
+                    task = asyncio.create_task(self.simulate_user(user_id, user_metrics[user_id]))
+                    tasks.append(task)
+                
+                # Wait for all users to complete
+                results = await asyncio.gather(*tasks)
+        finally:
+            await self.stop_log_writer()
         
-        # Wait for all users to complete
-        results = await asyncio.gather(*tasks)
+        for metrics in user_metrics:
+            self.merge_metrics(metrics)
         
         # Calculate metrics
         total_time = time.time() - self.start_time
         self.calculate_and_display_metrics(total_time)
     
+    def merge_metrics(self, metrics: Dict[str, Any]):
+        """Fold a user's metrics into the overall test metrics"""
+        self.metrics["orders_created"] += metrics["orders_created"]
+        self.metrics["orders_dispatched"] += metrics["orders_dispatched"]
+        self.metrics["orders_failed"] += metrics["orders_failed"]
+        self.metrics["response_times"].merge(metrics["response_times"])
+        self.metrics["batch_response_times"].extend(metrics["batch_response_times"])
+        self.metrics["errors"].extend(metrics["errors"])
+    
     def calculate_and_display_metrics(self, total_time: float):
         """Calculate and display test metrics"""
-        print("\n" + "="*60)
-        print(f"LOAD TEST RESULTS - {self.scenario['name']}")
-        print("="*60)
+        lines = [
+            "\n" + "="*60,
+            f"LOAD TEST RESULTS - {self.scenario['name']}",
+            "="*60,
+        ]
         
         # Basic metrics
-        print(f"\nTest Duration: {total_time:.2f} seconds")
-        print(f"Total Orders Created: {self.metrics['orders_created']}")
-        print(f"Total Orders Dispatched: {self.metrics['orders_dispatched']}")
-        print(f"Failed Operations: {self.metrics['orders_failed']}")
+        lines.append(f"\nTest Duration: {total_time:.2f} seconds")
+        lines.append(f"Total Orders Created: {self.metrics['orders_created']}")
+        lines.append(f"Total Orders Dispatched: {self.metrics['orders_dispatched']}")
+        lines.append(f"Failed Operations: {self.metrics['orders_failed']}")
         
         # Response time statistics
         if self.metrics["response_times"]:
-            avg_response = statistics.mean(self.metrics["response_times"])
-            min_response = min(self.metrics["response_times"])
-            max_response = max(self.metrics["response_times"])
-            p95_response = statistics.quantiles(self.metrics["response_times"], n=20)[18]  # 95th percentile
+            response_times = self.metrics["response_times"]
+            avg_response = response_times.mean
+            min_response = response_times.min
+            max_response = response_times.max
+            p50_response, p95_response, p99_response = response_times.percentiles([50, 95, 99])
             
-            print(f"\nResponse Time Statistics:")
-            print(f"  Average: {avg_response*1000:.2f} ms")
-            print(f"  Min: {min_response*1000:.2f} ms")
-            print(f"  Max: {max_response*1000:.2f} ms")
-            print(f"  95th Percentile: {p95_response*1000:.2f} ms")
+            lines.append(f"\nResponse Time Statistics:")
+            lines.append(f"  Average: {avg_response*1000:.2f} ms")
+            lines.append(f"  Min: {min_response*1000:.2f} ms")
+            lines.append(f"  Max: {max_response*1000:.2f} ms")
+            lines.append(f"  Std Dev: {response_times.stdev*1000:.2f} ms")
+            lines.append(f"  50th Percentile: {p50_response*1000:.2f} ms")
+            lines.append(f"  95th Percentile: {p95_response*1000:.2f} ms")
+            lines.append(f"  99th Percentile: {p99_response*1000:.2f} ms")
+        
+        if self.metrics["batch_response_times"]:
+            avg_batch = np.mean(self.metrics["batch_response_times"])
+            lines.append(f"\nBulk Request Statistics:")
+            lines.append(f"  Requests: {len(self.metrics['batch_response_times'])}")
+            lines.append(f"  Average: {avg_batch*1000:.2f} ms")
         
         # Throughput
         orders_per_second = self.metrics["orders_created"] / total_time
-        print(f"\nThroughput: {orders_per_second:.2f} orders/second")
+        lines.append(f"\nThroughput: {orders_per_second:.2f} orders/second")
         
         # Success rate
         total_operations = self.metrics["orders_created"] + self.metrics["orders_failed"]
         if total_operations > 0:
             success_rate = (self.metrics["orders_created"] / total_operations) * 100
-            print(f"Success Rate: {success_rate:.1f}%")
+            lines.append(f"Success Rate: {success_rate:.1f}%")
         
         # Errors
         if self.metrics["errors"]:
-            print(f"\nErrors encountered: {len(self.metrics['errors'])}")
-            print("Sample errors:")
+            lines.append(f"\nErrors encountered: {len(self.metrics['errors'])}")
+            lines.append("Sample errors:")
             for error in self.metrics["errors"][:5]:
-                print(f"  - {error}")
+                lines.append(f"  - {error}")
         
-        print("\n" + "="*60)
+        lines.append("\n" + "="*60)
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 async def main():
     """Main entry point"""
+    global API_BASE_URL
+    
     parser = argparse.ArgumentParser(description="Load test the Golf Course Delivery System")
     parser.add_argument(
         "--scenario",
@@ -228,11 +520,15 @@ async def main():
         default=API_BASE_URL,
         help="Base URL of the API"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Submit each user's orders through the bulk create/dispatch endpoints"
+    )
     
     args = parser.parse_args()
     
     # Update base URL if provided
-    global API_BASE_URL
     API_BASE_URL = args.url
     
     print(f"""
@@ -245,9 +541,15 @@ async def main():
     """)
     
     # Run the load test
-    tester = LoadTester(args.scenario)
+    tester = LoadTester(args.scenario, bulk=args.bulk)
     await tester.run_load_test()
 
 
 if __name__ == "__main__":
+    # uvloop is optional; it speeds up the socket-heavy event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
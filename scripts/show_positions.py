@@ -3,19 +3,26 @@
 Display current asset positions and status
 Shows the randomized starting positions of all assets
 """
+import argparse
+import numpy as np
 import requests
 import json
+import sys
+import time
 from datetime import datetime
 from typing import Dict, Any
 
 API_BASE_URL = "http://localhost:8000"
 
+# Shared session so repeated polls reuse the same keep-alive connection
+_SESSION = requests.Session()
+
 def get_asset_info():
     """Fetch and display current asset information"""
     try:
-        response = requests.get(f"{API_BASE_URL}/api/assets")
+        response = _SESSION.get(f"{API_BASE_URL}/api/assets", timeout=2)
         if response.status_code == 200:
-            return response.json()
+            return tag_locations(response.json())
         else:
             print(f"Error: Unable to fetch assets (status code: {response.status_code})")
             return []
@@ -23,56 +30,93 @@ def get_asset_info():
         print(f"Error connecting to API: {e}")
         return []
 
-def display_course_map(assets):
-    """Display a visual representation of the golf course with asset positions"""
-    # Create a map of positions
-    position_map = {}
+def tag_locations(assets):
+    """Tag each asset with an integer `_hole` (-1 when not on a hole) once at ingest"""
     for asset in assets:
-        location = str(asset['current_location'])
-        if location not in position_map:
-            position_map[location] = []
-        position_map[location].append(asset)
+        location = asset['current_location']
+        if isinstance(location, int):
+            asset['_hole'] = location
+        else:
+            asset['_hole'] = int(location) if str(location).isdigit() else -1
+    return assets
+
+def index_assets(assets):
+    """Build the position map and distribution statistics in a single pass"""
+    position_map = {}
+    holes = np.empty(len(assets), dtype=np.int16)
+    statuses = []
+    asset_types = []
+    
+    for i, asset in enumerate(assets):
+        # Holes are keyed by their integer, anything else by its location name
+        hole = asset['_hole']
+        key = hole if hole > 0 else str(asset['current_location'])
+        position_map.setdefault(key, []).append(asset)
+        holes[i] = hole
+        statuses.append(asset['status'])
+        asset_types.append(asset['asset_type'])
+    
+    # Derive every count with array reductions over the collected columns
+    statuses = np.array(statuses, dtype=str)
+    asset_types = np.array(asset_types, dtype=str)
+    stats = {
+        "total": len(assets),
+        "available": int(np.count_nonzero(statuses == 'available')),
+        "busy": int(np.count_nonzero(statuses == 'on_delivery')),
+        "carts": int(np.count_nonzero(asset_types == 'beverage_cart')),
+        "staff": int(np.count_nonzero(asset_types == 'delivery_staff')),
+        "front_nine": int(np.count_nonzero((holes >= 1) & (holes <= 9))),
+        "back_nine": int(np.count_nonzero((holes >= 10) & (holes <= 18))),
+        "clubhouse": len(position_map.get('clubhouse', ())),
+    }
     
-    print("\n" + "="*70)
-    print("GOLF COURSE MAP - Current Asset Positions")
-    print("="*70)
+    return position_map, stats
+
+def display_course_map(position_map):
+    """Display a visual representation of the golf course with asset positions"""
+    lines = [
+        "\n" + "="*70,
+        "GOLF COURSE MAP - Current Asset Positions",
+        "="*70,
+    ]
     
     # Clubhouse
-    print("\n🏢 CLUBHOUSE:")
+    lines.append("\n🏢 CLUBHOUSE:")
     if "clubhouse" in position_map:
         for asset in position_map["clubhouse"]:
-            print(f"   → {asset['name']} ({asset['asset_type']}) - {asset['status']}")
+            lines.append(f"   → {asset['name']} ({asset['asset_type']}) - {asset['status']}")
     else:
-        print("   (empty)")
+        lines.append("   (empty)")
     
     # Front Nine
-    print("\n⛳ FRONT NINE (Holes 1-9):")
+    lines.append("\n⛳ FRONT NINE (Holes 1-9):")
     for hole in range(1, 10):
-        hole_str = str(hole)
-        if hole_str in position_map:
-            print(f"   Hole {hole}:")
-            for asset in position_map[hole_str]:
+        if hole in position_map:
+            lines.append(f"   Hole {hole}:")
+            for asset in position_map[hole]:
                 status_icon = "🟢" if asset['status'] == 'available' else "🔴"
-                print(f"      {status_icon} {asset['name']} ({asset['asset_type']})")
+                lines.append(f"      {status_icon} {asset['name']} ({asset['asset_type']})")
     
     # Back Nine
-    print("\n⛳ BACK NINE (Holes 10-18):")
+    lines.append("\n⛳ BACK NINE (Holes 10-18):")
     for hole in range(10, 19):
-        hole_str = str(hole)
-        if hole_str in position_map:
-            print(f"   Hole {hole}:")
-            for asset in position_map[hole_str]:
+        if hole in position_map:
+            lines.append(f"   Hole {hole}:")
+            for asset in position_map[hole]:
                 status_icon = "🟢" if asset['status'] == 'available' else "🔴"
-                print(f"      {status_icon} {asset['name']} ({asset['asset_type']})")
+                lines.append(f"      {status_icon} {asset['name']} ({asset['asset_type']})")
     
-    print("\n" + "="*70)
+    lines.append("\n" + "="*70)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def display_asset_details(assets):
     """Display detailed information about each asset"""
-    print("\nASSET DETAILS:")
-    print("-"*70)
-    print(f"{'Name':<15} {'Type':<15} {'Location':<10} {'Status':<12} {'Orders':<10}")
-    print("-"*70)
+    lines = [
+        "\nASSET DETAILS:",
+        "-"*70,
+        f"{'Name':<15} {'Type':<15} {'Location':<10} {'Status':<12} {'Orders':<10}",
+        "-"*70,
+    ]
     
     for asset in assets:
         name = asset['name']
@@ -89,39 +133,36 @@ def display_asset_details(assets):
         else:
             status_display = f"❓ {status}"
         
-        print(f"{name:<15} {asset_type:<15} {location:<10} {status_display:<20} {orders:<10}")
+        lines.append(f"{name:<15} {asset_type:<15} {location:<10} {status_display:<20} {orders:<10}")
     
-    print("-"*70)
+    lines.append("-"*70)
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def display_statistics(assets):
+def display_statistics(stats):
     """Display statistics about asset distribution"""
-    total_assets = len(assets)
-    available = sum(1 for a in assets if a['status'] == 'available')
-    busy = sum(1 for a in assets if a['status'] == 'on_delivery')
-    
-    carts = [a for a in assets if a['asset_type'] == 'beverage_cart']
-    staff = [a for a in assets if a['asset_type'] == 'delivery_staff']
-    
-    front_nine_assets = sum(1 for a in assets if str(a['current_location']).isdigit() and 1 <= int(a['current_location']) <= 9)
-    back_nine_assets = sum(1 for a in assets if str(a['current_location']).isdigit() and 10 <= int(a['current_location']) <= 18)
-    clubhouse_assets = sum(1 for a in assets if a['current_location'] == 'clubhouse')
-    
-    print("\nSTATISTICS:")
-    print("-"*40)
-    print(f"Total Assets: {total_assets}")
-    print(f"  - Beverage Carts: {len(carts)}")
-    print(f"  - Delivery Staff: {len(staff)}")
-    print(f"\nAvailability:")
-    print(f"  - Available: {available} ({available/total_assets*100:.1f}%)")
-    print(f"  - Busy: {busy} ({busy/total_assets*100:.1f}%)")
-    print(f"\nLocation Distribution:")
-    print(f"  - Front Nine: {front_nine_assets}")
-    print(f"  - Back Nine: {back_nine_assets}")
-    print(f"  - Clubhouse: {clubhouse_assets}")
-    print("-"*40)
+    total_assets = stats["total"]
+    available = stats["available"]
+    busy = stats["busy"]
+    
+    lines = [
+        "\nSTATISTICS:",
+        "-"*40,
+        f"Total Assets: {total_assets}",
+        f"  - Beverage Carts: {stats['carts']}",
+        f"  - Delivery Staff: {stats['staff']}",
+        f"\nAvailability:",
+        f"  - Available: {available} ({available/total_assets*100:.1f}%)",
+        f"  - Busy: {busy} ({busy/total_assets*100:.1f}%)",
+        f"\nLocation Distribution:",
+        f"  - Front Nine: {stats['front_nine']}",
+        f"  - Back Nine: {stats['back_nine']}",
+        f"  - Clubhouse: {stats['clubhouse']}",
+        "-"*40,
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def main():
-    """Main function"""
+def show_positions():
+    """Fetch and display asset positions once"""
     print(f"\n🏌️ Golf Course Delivery System - Asset Position Monitor")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
@@ -134,14 +175,39 @@ def main():
         return
     
     # Display the information
-    display_course_map(assets)
+    position_map, stats = index_assets(assets)
+    display_course_map(position_map)
     display_asset_details(assets)
-    display_statistics(assets)
+    display_statistics(stats)
     
     print("\n💡 TIP: Assets start at randomized positions each time the system starts!")
     print("   Cart 1 (Reese): Random position on Front 9 (holes 1-9)")
     print("   Cart 2 (Bev-Cart 2): Random position on Back 9 (holes 10-18)")
     print("   Staff members: Random positions anywhere on the course")
 
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Show current asset positions")
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="N",
+        help="Refresh every N seconds over the same connection"
+    )
+    args = parser.parse_args()
+    
+    if not args.watch:
+        show_positions()
+        return
+    
+    try:
+        while True:
+            show_positions()
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _SESSION.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,6 +3,10 @@ Configuration for Golf Course Delivery System Simulation
 Adjust these settings to customize the randomization behavior
 """
 import random
+from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate
+from types import MappingProxyType
 
 # Asset Starting Position Configurations
 ASSET_START_CONFIG = {
@@ -10,37 +14,33 @@ ASSET_START_CONFIG = {
         "name": "Reese",
         "type": "beverage_cart",
         "loop": "front_9",
-        "start_locations": lambda: random.choice(list(range(1, 10))),  # Random hole 1-9
+        "start_locations": tuple(range(1, 10)),  # Random hole 1-9
         "preferred_zones": list(range(1, 10))
     },
     "cart2": {
         "name": "Bev-Cart 2",
         "type": "beverage_cart", 
         "loop": "back_9",
-        "start_locations": lambda: random.choice(list(range(10, 19))),  # Random hole 10-18
+        "start_locations": tuple(range(10, 19)),  # Random hole 10-18
         "preferred_zones": list(range(10, 19))
     },
     "staff1": {
         "name": "Esteban",
         "type": "delivery_staff",
-        "start_locations": lambda: random.choice(
-            ["clubhouse", "clubhouse"] +  # Higher chance of starting at clubhouse
-            list(range(1, 19))
-        ),
+        "start_locations": ("clubhouse",) + tuple(range(1, 19)),
+        "start_weights": (2,) + (1,) * 18,  # Higher chance of starting at clubhouse
         "preferred_zones": None  # Can go anywhere
     },
     "staff2": {
         "name": "Dylan",
         "type": "delivery_staff",
-        "start_locations": lambda: random.choice(
-            ["clubhouse"] + list(range(1, 19))  # Equal chance of any location
-        ),
+        "start_locations": ("clubhouse",) + tuple(range(1, 19)),  # Equal chance of any location
         "preferred_zones": None
     },
     "staff3": {
         "name": "Paige",
         "type": "delivery_staff",
-        "start_locations": lambda: random.choice(list(range(1, 19))),  # Starts on course
+        "start_locations": tuple(range(1, 19)),  # Starts on course
         "preferred_zones": None
     }
 }
@@ -68,19 +68,19 @@ ORDER_CONFIG = {
     "time_based_menu": {
         "morning": {
             "hours": (6, 10),
-            "items": ["Coffee", "Breakfast Sandwich", "Energy Bar", "Orange Juice", "Water", "Banana"]
+            "items": ("Coffee", "Breakfast Sandwich", "Energy Bar", "Orange Juice", "Water", "Banana")
         },
         "midday": {
             "hours": (10, 14),
-            "items": ["Beer", "Hot Dog", "Burger", "Soda", "Chips", "Water", "Nachos"]
+            "items": ("Beer", "Hot Dog", "Burger", "Soda", "Chips", "Water", "Nachos")
         },
         "afternoon": {
             "hours": (14, 17),
-            "items": ["Beer", "Energy Drink", "Snacks", "Ice Pack", "Water", "Pretzel"]
+            "items": ("Beer", "Energy Drink", "Snacks", "Ice Pack", "Water", "Pretzel")
         },
         "evening": {
             "hours": (17, 22),
-            "items": ["Beer", "Sandwich", "Chips", "Soda", "Water", "Wings"]
+            "items": ("Beer", "Sandwich", "Chips", "Soda", "Water", "Wings")
         }
     },
     "order_patterns": {
@@ -104,6 +104,20 @@ ORDER_CONFIG = {
     ]
 }
 
+def _freeze(value):
+    """Recursively make config read-only: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# Frozen so the values cached below can never drift from the config at runtime
+ORDER_CONFIG = _freeze(ORDER_CONFIG)
+
+_CLUSTER_CHANCE = ORDER_CONFIG["order_patterns"]["cluster_chance"]
+_CLUSTER_MIN, _CLUSTER_MAX = ORDER_CONFIG["order_patterns"]["cluster_size_range"]
+
 # Simulation Timing Configurations
 TIMING_CONFIG = {
     "simulation_duration": 300,              # 5 minutes default
@@ -148,19 +162,27 @@ LOAD_TEST_SCENARIOS = {
     }
 }
 
+# Starting location populations and cumulative weights, resolved once at import
+_START_POPS = {
+    asset_id: (
+        config["start_locations"],
+        list(accumulate(config.get("start_weights", (1,) * len(config["start_locations"]))))
+    )
+    for asset_id, config in ASSET_START_CONFIG.items()
+    if "start_locations" in config
+}
+
 # Randomization Helper Functions
 def get_random_start_location(asset_id: str):
     """Get random starting location for an asset"""
-    config = ASSET_START_CONFIG.get(asset_id, {})
-    if "start_locations" in config:
-        return config["start_locations"]()
-    return "clubhouse"
+    if asset_id not in _START_POPS:
+        return "clubhouse"
+    population, cum_weights = _START_POPS[asset_id]
+    return random.choices(population, cum_weights=cum_weights)[0]
 
-def get_random_menu_items():
-    """Get menu items based on time of day"""
-    from datetime import datetime
-    hour = datetime.now().hour
-    
+@lru_cache(maxsize=24)
+def _menu_for_hour(hour: int) -> tuple:
+    """Resolve the menu for a given hour of the day"""
     for period, config in ORDER_CONFIG["time_based_menu"].items():
         start_hour, end_hour = config["hours"]
         if start_hour <= hour < end_hour:
@@ -169,21 +191,30 @@ def get_random_menu_items():
     # Default to midday menu
     return ORDER_CONFIG["time_based_menu"]["midday"]["items"]
 
+def get_random_menu_items():
+    """Get menu items based on time of day"""
+    return _menu_for_hour(datetime.now().hour)
+
+# Special instruction templates tagged with the placeholders they use
+_INSTRUCTIONS = [
+    (template, "{hole}" in template, "{players}" in template)
+    for template in ORDER_CONFIG["special_instructions"]
+]
+
 def get_random_special_instruction(hole_number: int):
     """Get random special instruction for an order"""
-    instruction_template = random.choice(ORDER_CONFIG["special_instructions"])
-    if instruction_template:
-        return instruction_template.format(
-            hole=hole_number,
-            players=random.randint(2, 4)
-        )
-    return ""
+    template, has_hole, has_players = random.choice(_INSTRUCTIONS)
+    if not (has_hole or has_players):
+        return template
+    values = {"hole": hole_number}
+    if has_players:
+        values["players"] = random.randint(2, 4)
+    return template.format_map(values)
 
 def should_create_cluster():
     """Determine if orders should be clustered"""
-    return random.random() < ORDER_CONFIG["order_patterns"]["cluster_chance"]
+    return random.random() < _CLUSTER_CHANCE
 
 def get_cluster_size():
     """Get size of order cluster"""
-    min_size, max_size = ORDER_CONFIG["order_patterns"]["cluster_size_range"]
-    return random.randint(min_size, max_size)
\ No newline at end of file
+    return random.randint(_CLUSTER_MIN, _CLUSTER_MAX)
\ No newline at end of file
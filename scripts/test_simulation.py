@@ -3,138 +3,267 @@
 Golf Course Delivery System - Test Simulation
 Simulates orders and asset movements with dummy locations
 """
+import argparse
 import asyncio
 import random
-import requests
+import httpx
 import json
+import logging
+import sys
 import time
 from datetime import datetime
+from itertools import accumulate
 from typing import List, Dict, Any
 import websockets
-import threading
+
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+    def format_json(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    json_loads = json.loads
+    def format_json(data: Any) -> str:
+        return json.dumps(data, indent=2)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_write = sys.stdout.write
+logger = logging.getLogger("sim")
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 WS_URL = "ws://localhost:8000/ws"
+JSON_HEADERS = {"Content-Type": "application/json"}
+LOCATION_BATCH_WINDOW = 0.2  # Seconds to wait for more moves before sending a batch
 
 # Golf course dummy locations (hole numbers)
-GOLF_HOLES = list(range(1, 19))
-FRONT_NINE = list(range(1, 10))
-BACK_NINE = list(range(10, 19))
+GOLF_HOLES = tuple(range(1, 19))
+FRONT_NINE = tuple(range(1, 10))
+BACK_NINE = tuple(range(10, 19))
 CLUBHOUSE = "clubhouse"
 
+# Movement candidates per current hole, precomputed once. Keyed by every course hole
+# because a cart can end a delivery outside its own loop.
+NEARBY_ANY = {h: tuple(x for x in GOLF_HOLES if abs(x - h) <= 3) for h in GOLF_HOLES}
+FAR_FRONT = {h: tuple(x for x in FRONT_NINE if abs(x - h) > 2) for h in GOLF_HOLES}
+FAR_BACK = {h: tuple(x for x in BACK_NINE if abs(x - h) > 2) for h in GOLF_HOLES}
+
+# Front nine gets 60% of orders and back nine 40%, spread evenly over each nine
+HOLE_CUM_WEIGHTS = list(accumulate([0.6 / 9] * 9 + [0.4 / 9] * 9))
+
 # Sample orders items
-MENU_ITEMS = [
+MENU_ITEMS = (
     "Hot Dog", "Burger", "Beer", "Soda", "Water", "Chips", 
     "Candy Bar", "Golf Balls", "Tees", "Sandwich", "Energy Drink",
     "Gatorade", "Trail Mix", "Sunscreen", "Towel", "Ice Pack"
-]
+)
 
 # Realistic time-based menu preferences
+_MORNING = ("Coffee", "Breakfast Sandwich", "Energy Bar", "Orange Juice", "Water")
+_MIDDAY = ("Beer", "Hot Dog", "Burger", "Soda", "Chips", "Water")
+_AFTERNOON = ("Beer", "Energy Drink", "Snacks", "Ice Pack", "Water")
+_EVENING = ("Beer", "Sandwich", "Chips", "Soda", "Water")
+
+# Menu for every hour of the day, resolved once
+_HOURLY = {
+    h: _MORNING if 6 <= h < 10 else _MIDDAY if 10 <= h < 14 else _AFTERNOON if 14 <= h < 17 else _EVENING
+    for h in range(24)
+}
+
 def get_menu_items_by_time():
     """Get menu items based on simulated time of day"""
-    hour = datetime.now().hour
-    
-    if 6 <= hour < 10:  # Morning
-        return ["Coffee", "Breakfast Sandwich", "Energy Bar", "Orange Juice", "Water"]
-    elif 10 <= hour < 14:  # Midday
-        return ["Beer", "Hot Dog", "Burger", "Soda", "Chips", "Water"]
-    elif 14 <= hour < 17:  # Afternoon
-        return ["Beer", "Energy Drink", "Snacks", "Ice Pack", "Water"]
-    else:  # Evening
-        return ["Beer", "Sandwich", "Chips", "Soda", "Water"]
+    return _HOURLY[datetime.now().hour]
+
+class _StopSimulation(Exception):
+    """Raised inside the task group to end the run and cancel its tasks"""
+
+
+async def _stop_after(duration: float):
+    """Stop the simulation's task group after the run duration"""
+    await asyncio.sleep(duration)
+    raise _StopSimulation()
+
 
 class GolfCourseSimulator:
     """Simulates a golf course delivery system"""
     
     def __init__(self, base_url: str = API_BASE_URL):
         self.base_url = base_url
+        self.rng = random.Random()  # Per-simulator RNG, independent of the global random state
         self.assets = []
         self.orders = []
         self.ws_client = None
         self.asset_movement_patterns = {}
+        self._pending_moves: asyncio.Queue = asyncio.Queue()
+        # Latest known state per asset, seeded from the API and kept current by WebSocket events
+        self.asset_state: Dict[str, Dict[str, Any]] = {}
+        self._asset_ready: Dict[str, asyncio.Event] = {}
+        self._last_ts_sec = 0
+        self._last_ts_str = ""
+        
+        # Pooled keep-alive connections shared by every request the simulator makes,
+        # non-blocking so movement, order and WebSocket tasks overlap their I/O
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            ),
+            timeout=5.0
+        )
         
     def log(self, message: str, level: str = "INFO"):
         """Log messages with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] [{level}] {message}")
+        # Timestamps have second resolution, so format at most once per second
+        sec = int(time.time())
+        if sec != self._last_ts_sec:
+            self._last_ts_sec = sec
+            self._last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        _write("[" + self._last_ts_str + "] [" + level + "] " + message + "\n")
         
-    def check_api_health(self) -> bool:
+    async def check_api_health(self) -> bool:
         """Check if API is healthy"""
         try:
-            response = requests.get(f"{self.base_url}/")
+            response = await self.http.get("/")
             return response.status_code == 200
         except Exception as e:
             self.log(f"API health check failed: {e}", "ERROR")
             return False
     
-    def get_assets(self) -> List[Dict[str, Any]]:
+    async def get_assets(self) -> List[Dict[str, Any]]:
         """Get all delivery assets"""
         try:
-            response = requests.get(f"{self.base_url}/api/assets")
+            response = await self.http.get("/api/assets")
             if response.status_code == 200:
-                self.assets = response.json()
+                self.assets = json_loads(response.content)
                 # Initialize movement patterns for each asset
                 for asset in self.assets:
                     self.asset_movement_patterns[asset['asset_id']] = {
-                        'direction': random.choice(['forward', 'backward']),
+                        'direction': self.rng.choice(['forward', 'backward']),
                         'last_move_time': time.time(),
                         'idle_time': 0
                     }
+                    self.asset_state[asset['asset_id']] = dict(asset)
+                    self._asset_event(asset['asset_id']).set()
                 return self.assets
             return []
         except Exception as e:
             self.log(f"Failed to get assets: {e}", "ERROR")
             return []
     
-    def create_order(self, hole_number: int) -> Dict[str, Any]:
-        """Create a new order at specified hole"""
+    def build_order_data(self, hole_number: int) -> Dict[str, Any]:
+        """Build a realistic order payload for the specified hole"""
         # Use time-based menu or random items
-        if random.random() < 0.7:  # 70% chance of time-based menu
+        if self.rng.random() < 0.7:  # 70% chance of time-based menu
             available_items = get_menu_items_by_time()
         else:
             available_items = MENU_ITEMS
         
-        items = random.sample(available_items, k=random.randint(1, 3))
+        items = self.rng.sample(available_items, k=self.rng.randint(1, 3))
         
         # Add realistic special instructions
-        special_instructions = random.choice([
+        special_instructions = self.rng.choice([
             f"Player at hole {hole_number} tee box",
             f"Deliver to hole {hole_number} green",
-            f"Group of {random.randint(2, 4)} at hole {hole_number}",
+            f"Group of {self.rng.randint(2, 4)} at hole {hole_number}",
             f"Quick delivery needed at hole {hole_number}",
             f"Call when arriving at hole {hole_number}",
             ""  # No special instructions
         ])
         
-        order_data = {
+        return {
             "hole_number": hole_number,
             "items": items,
             "special_instructions": special_instructions
         }
+    
+    async def create_order(self, hole_number: int) -> Dict[str, Any]:
+        """Create a new order at specified hole"""
+        order_data = self.build_order_data(hole_number)
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/orders",
-                json=order_data
+            response = await self.http.post(
+                "/api/orders",
+                content=json_dumps(order_data),
+                headers=JSON_HEADERS
             )
             if response.status_code == 200:
-                order = response.json()
+                order = json_loads(response.content)
                 self.orders.append(order)
-                self.log(f"Created order {order['order_id']} for hole {hole_number} - Items: {', '.join(items)}")
+                self.log(f"Created order {order['order_id']} for hole {hole_number} - Items: {', '.join(order_data['items'])}")
                 return order
         except Exception as e:
             self.log(f"Failed to create order: {e}", "ERROR")
         return {}
     
-    def dispatch_order(self, order_id: str) -> Dict[str, Any]:
+    async def create_orders_batch(self, hole_numbers: List[int]) -> List[Dict[str, Any]]:
+        """Create orders at several holes in one request, then dispatch them all in another"""
+        pending = [self.build_order_data(hole) for hole in hole_numbers]
+        
+        try:
+            response = await self.http.post(
+                "/api/orders/bulk",
+                content=json_dumps(pending),
+                headers=JSON_HEADERS
+            )
+            if response.status_code == 404:
+                # Older servers have no bulk endpoints
+                return await self.create_orders_concurrently(hole_numbers)
+            if response.status_code != 200:
+                return []
+            orders = json_loads(response.content)
+            for order, order_data in zip(orders, pending):
+                self.orders.append(order)
+                self.log(f"Created order {order['order_id']} for hole {order['hole_number']} - Items: {', '.join(order_data['items'])}")
+            
+            response = await self.http.post(
+                "/api/orders/dispatch",
+                content=json_dumps({"order_ids": [order['order_id'] for order in orders]}),
+                headers=JSON_HEADERS
+            )
+            dispatches = {}
+            if response.status_code == 200:
+                # Orders the server could not dispatch are left out of the response
+                for dispatch in json_loads(response.content):
+                    dispatches[dispatch['order_id']] = dispatch
+                    self.log(
+                        f"Order {dispatch['order_id']} dispatched to {dispatch['asset_name']} "
+                        f"(ETA: {dispatch['eta_minutes']:.1f} min, "
+                        f"Delivery at hole {dispatch['predicted_delivery_hole']})"
+                    )
+            return [
+                {"order": order, "dispatch": dispatches.get(order['order_id'])}
+                for order in orders
+            ]
+        except Exception as e:
+            self.log(f"Failed to create order batch: {e}", "ERROR")
+        return []
+    
+    async def create_orders_concurrently(self, hole_numbers: List[int]) -> List[Dict[str, Any]]:
+        """Create orders concurrently, then dispatch the created ones concurrently"""
+        orders = await asyncio.gather(*[self.create_order(hole) for hole in hole_numbers])
+        orders = [order for order in orders if order]
+        dispatches = await asyncio.gather(*[self.dispatch_order(order['order_id']) for order in orders])
+        return [
+            {"order": order, "dispatch": dispatch or None}
+            for order, dispatch in zip(orders, dispatches)
+        ]
+    
+    async def dispatch_order(self, order_id: str) -> Dict[str, Any]:
         """Dispatch an order to best available asset"""
         try:
-            response = requests.post(
-                f"{self.base_url}/api/orders/{order_id}/dispatch"
+            response = await self.http.post(
+                f"/api/orders/{order_id}/dispatch"
             )
             if response.status_code == 200:
-                dispatch = response.json()
+                dispatch = json_loads(response.content)
                 self.log(
                     f"Order {order_id} dispatched to {dispatch['asset_name']} "
                     f"(ETA: {dispatch['eta_minutes']:.1f} min, "
@@ -156,28 +285,30 @@ class GolfCourseSimulator:
             if asset_type == "beverage_cart":
                 # Cart should go to first/last hole of their loop
                 if asset.get('loop') == 'front_9':
-                    return random.choice([1, 5])
+                    return self.rng.choice([1, 5])
                 else:
-                    return random.choice([10, 14])
+                    return self.rng.choice([10, 14])
             else:
                 # Staff can go anywhere
-                return random.choice(GOLF_HOLES)
+                return self.rng.choice(GOLF_HOLES)
         
         # Convert to int if needed
         try:
             current_hole = int(current_location)
         except:
-            return random.choice(GOLF_HOLES)
+            return self.rng.choice(GOLF_HOLES)
         
         # Beverage cart movement
         if asset_type == "beverage_cart":
             if asset.get('loop') == 'front_9':
                 valid_holes = FRONT_NINE
+                far_holes = FAR_FRONT
             else:
                 valid_holes = BACK_NINE
+                far_holes = FAR_BACK
             
             # Sequential movement with occasional jumps
-            if random.random() < 0.8:  # 80% sequential movement
+            if self.rng.random() < 0.8:  # 80% sequential movement
                 if pattern.get('direction') == 'forward':
                     next_hole = current_hole + 1
                     if next_hole not in valid_holes:
@@ -191,46 +322,99 @@ class GolfCourseSimulator:
                 return next_hole if next_hole in valid_holes else current_hole
             else:
                 # Jump to service a different area
-                return random.choice([h for h in valid_holes if abs(h - current_hole) > 2])
+                return self.rng.choice(far_holes[current_hole])
         
         # Delivery staff movement - more flexible
         else:
-            # Staff tend to move between orders, can jump around more
-            if random.random() < 0.3:  # 30% chance to return to clubhouse
+            # Staff tend to move between orders, can jump around more.
+            # One draw against cumulative thresholds: 30% clubhouse, 42% nearby, 28% anywhere
+            r = self.rng.random()
+            if r < 0.3:  # 30% chance to return to clubhouse
                 return "clubhouse"
-            elif random.random() < 0.6:  # Move to nearby hole
-                nearby_holes = [h for h in GOLF_HOLES if abs(h - current_hole) <= 3]
-                return random.choice(nearby_holes) if nearby_holes else current_hole
+            elif r < 0.72:  # Move to nearby hole
+                nearby_holes = NEARBY_ANY.get(current_hole)
+                return self.rng.choice(nearby_holes) if nearby_holes else current_hole
             else:  # Jump to any hole
-                return random.choice(GOLF_HOLES)
+                return self.rng.choice(GOLF_HOLES)
     
-    def update_asset_location(self, asset_id: str, location: Any):
+    async def update_asset_location(self, asset_id: str, location: Any):
         """Update asset location"""
         try:
-            response = requests.post(
-                f"{self.base_url}/api/assets/{asset_id}/location",
-                json={"location": location}
+            response = await self.http.post(
+                f"/api/assets/{asset_id}/location",
+                content=json_dumps({"location": location}),
+                headers=JSON_HEADERS
             )
             if response.status_code == 200:
                 self.log(f"Updated {asset_id} location to {location}")
-                return response.json()
+                return json_loads(response.content)
         except Exception as e:
             self.log(f"Failed to update asset location: {e}", "ERROR")
         return {}
     
-    def complete_order(self, order_id: str):
+    async def flush_location_updates(self):
+        """Send queued asset moves to the API in batches, one request per batch"""
+        while True:
+            moves = [await self._pending_moves.get()]
+            # Give the other movement tasks a moment to queue their moves too
+            await asyncio.sleep(LOCATION_BATCH_WINDOW)
+            while not self._pending_moves.empty():
+                moves.append(self._pending_moves.get_nowait())
+            
+            # Only the latest move per asset matters
+            latest = dict(moves)
+            updates = [
+                {"asset_id": asset_id, "location": location}
+                for asset_id, location in latest.items()
+            ]
+            try:
+                response = await self.http.post(
+                    "/api/assets/locations",
+                    content=json_dumps({"updates": updates}),
+                    headers=JSON_HEADERS
+                )
+                if response.status_code == 200:
+                    for asset in json_loads(response.content):
+                        self.log(f"Updated {asset['asset_id']} location to {asset['current_location']}")
+            except Exception as e:
+                self.log(f"Failed to update asset locations: {e}", "ERROR")
+    
+    async def complete_order(self, order_id: str):
         """Mark order as completed"""
         try:
-            response = requests.post(
-                f"{self.base_url}/api/orders/{order_id}/complete"
+            response = await self.http.post(
+                f"/api/orders/{order_id}/complete"
             )
             if response.status_code == 200:
                 self.log(f"Order {order_id} completed")
-                return response.json()
+                return json_loads(response.content)
         except Exception as e:
             self.log(f"Failed to complete order: {e}", "ERROR")
         return {}
     
+    def _asset_event(self, asset_id: str) -> asyncio.Event:
+        """Event that is set once state for the asset is known"""
+        event = self._asset_ready.get(asset_id)
+        if event is None:
+            event = self._asset_ready[asset_id] = asyncio.Event()
+        return event
+    
+    def apply_asset_event(self, data: Dict[str, Any]):
+        """Fold a WebSocket update into the local asset state"""
+        message_type = data['type']
+        if message_type == 'location_update':
+            state = self.asset_state.get(data['asset_id'])
+            if state is not None:
+                state['current_location'] = data['location']
+        elif message_type == 'status_update':
+            state = self.asset_state.get(data['asset_id'])
+            if state is not None:
+                state['status'] = data['status']
+        elif message_type == 'order_dispatched':
+            state = self.asset_state.get(data['dispatch']['asset_id'])
+            if state is not None:
+                state['status'] = 'en_route_to_dropoff'
+    
     async def simulate_asset_movement(self, asset: Dict[str, Any], duration: int = 60):
         """Simulate realistic asset movement around the course"""
         asset_id = asset['asset_id']
@@ -239,97 +423,115 @@ class GolfCourseSimulator:
         
         self.log(f"Starting movement simulation for {asset_name} ({asset_type})")
         
+        # Asset state is pushed over the WebSocket, so there is nothing to poll
+        await self._asset_event(asset_id).wait()
+        
         start_time = time.time()
         while time.time() - start_time < duration:
-            # Get current location from API
             try:
-                response = requests.get(f"{self.base_url}/api/assets/{asset_id}")
-                if response.status_code == 200:
-                    current_asset = response.json()
-                    current_location = current_asset['current_location']
+                current_asset = self.asset_state[asset_id]
+                current_location = current_asset['current_location']
+                
+                # Move based on asset status
+                if current_asset['status'] == 'available':
+                    # Get realistic next location
+                    new_location = self.get_next_realistic_location(current_asset, current_location)
                     
-                    # Move based on asset status
-                    if current_asset['status'] == 'available':
-                        # Get realistic next location
-                        new_location = self.get_next_realistic_location(current_asset, current_location)
-                        
-                        if new_location != current_location:
-                            self.update_asset_location(asset_id, new_location)
-                        
-                        # Variable wait time based on movement
-                        if new_location == "clubhouse":
-                            wait_time = random.randint(20, 40)  # Longer wait at clubhouse
-                        else:
-                            wait_time = random.randint(10, 25)  # Normal movement time
+                    if new_location != current_location:
+                        self._pending_moves.put_nowait((asset_id, new_location))
+                    
+                    # Variable wait time based on movement
+                    if new_location == "clubhouse":
+                        wait_time = self.rng.randint(20, 40)  # Longer wait at clubhouse
                     else:
-                        # Asset is busy, wait longer
-                        wait_time = random.randint(30, 45)
-                        
-                    await asyncio.sleep(wait_time)
+                        wait_time = self.rng.randint(10, 25)  # Normal movement time
+                else:
+                    # Asset is busy, wait longer
+                    wait_time = self.rng.randint(30, 45)
                     
+                await asyncio.sleep(wait_time)
+                
             except Exception as e:
                 self.log(f"Error in movement simulation for {asset_name}: {e}", "ERROR")
                 await asyncio.sleep(10)
     
     async def simulate_orders(self, num_orders: int = 10, interval: int = 30):
         """Simulate realistic incoming orders"""
-        # Order patterns - busier during certain "hours"
-        order_patterns = [
-            {'holes': FRONT_NINE, 'weight': 0.6},  # Front nine gets more orders
-            {'holes': BACK_NINE, 'weight': 0.4}
-        ]
+        # Bind the attributes used on every iteration to locals once
+        create = self.create_order
+        create_batch = self.create_orders_batch
+        dispatch = self.dispatch_order
+        sleep = asyncio.sleep
+        rnd = self.rng.random
+        randint = self.rng.randint
+        uniform = self.rng.uniform
+        last = num_orders - 1
+        
+        # Draw every order's hole up front from the weighted hole distribution
+        holes = self.rng.choices(GOLF_HOLES, cum_weights=HOLE_CUM_WEIGHTS, k=num_orders)
         
         for i in range(num_orders):
-            # Weighted hole selection
-            if random.random() < order_patterns[0]['weight']:
-                hole = random.choice(order_patterns[0]['holes'])
-            else:
-                hole = random.choice(order_patterns[1]['holes'])
+            hole = holes[i]
             
             # Occasionally cluster orders (groups playing together)
-            if random.random() < 0.3 and i < num_orders - 1:  # 30% chance of clustered orders
-                # Create 2-3 orders at nearby holes
-                cluster_size = random.randint(2, 3)
+            if rnd() < 0.3 and i < last:  # 30% chance of clustered orders
+                # Create 2-3 orders at nearby holes in one request, then dispatch them in another
+                cluster_size = randint(2, 3)
                 base_hole = hole
                 
-                for j in range(cluster_size):
-                    cluster_hole = max(1, min(18, base_hole + random.randint(-1, 1)))
-                    order = self.create_order(cluster_hole)
-                    if order:
-                        await asyncio.sleep(random.uniform(0.5, 2))
-                        self.dispatch_order(order['order_id'])
-                    
-                    if j < cluster_size - 1:
-                        await asyncio.sleep(random.randint(5, 10))
+                await create_batch([
+                    max(1, min(18, base_hole + randint(-1, 1)))
+                    for _ in range(cluster_size)
+                ])
                 
                 i += cluster_size - 1
             else:
                 # Single order
-                order = self.create_order(hole)
+                order = await create(hole)
                 if order:
                     # Random delay before dispatch (simulating order preparation)
-                    await asyncio.sleep(random.uniform(2, 5))
-                    self.dispatch_order(order['order_id'])
+                    await sleep(uniform(2, 5))
+                    await dispatch(order['order_id'])
             
             # Variable interval between order batches
-            if i < num_orders - 1:
+            if i < last:
                 # Rush hours have shorter intervals
-                rush_hour = random.random() < 0.3
+                rush_hour = rnd() < 0.3
                 if rush_hour:
-                    wait_time = random.randint(10, 20)
+                    wait_time = randint(10, 20)
                 else:
-                    wait_time = random.randint(interval - 10, interval + 10)
+                    wait_time = randint(interval - 10, interval + 10)
                 
-                await asyncio.sleep(wait_time)
+                await sleep(wait_time)
     
     async def websocket_monitor(self):
         """Monitor WebSocket for real-time updates"""
         try:
-            async with websockets.connect(WS_URL) as websocket:
+            # Ask for binary msgpack frames when we can decode them; the server may still send JSON text
+            subprotocols = ["msgpack"] if msgpack is not None else None
+            async with websockets.connect(
+                WS_URL,
+                max_size=2**20,
+                compression=None,  # Small frames; deflate costs more CPU than it saves
+                ping_interval=20,
+                ping_timeout=20,
+                subprotocols=subprotocols
+            ) as websocket:
                 self.log("Connected to WebSocket for real-time monitoring")
                 async for message in websocket:
-                    data = json.loads(message)
-                    self.log(f"WebSocket Update: {data['type']} - {json.dumps(data, indent=2)}", "WS")
+                    if isinstance(message, bytes):
+                        data = msgpack.unpackb(message, raw=False)
+                    else:
+                        data = json_loads(message)
+                    # The server coalesces events sent close together into one batch frame
+                    events = data['events'] if data['type'] == 'batch' else (data,)
+                    for event in events:
+                        message_type = event['type']
+                        self.apply_asset_event(event)
+                        self.log(f"WebSocket Update: {message_type}", "WS")
+                        # The pretty-printed payload is only built when debug logging is on (--verbose)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("WebSocket payload for %s:\n%s", message_type, format_json(event))
         except Exception as e:
             self.log(f"WebSocket error: {e}", "ERROR")
     
@@ -338,41 +540,51 @@ class GolfCourseSimulator:
         self.log("Starting Golf Course Delivery Simulation with Randomized Positions")
         
         # Check API health
-        if not self.check_api_health():
+        if not await self.check_api_health():
             self.log("API is not healthy. Please ensure the service is running.", "ERROR")
+            await self.http.aclose()
             return
         
         # Get initial assets
-        assets = self.get_assets()
+        assets = await self.get_assets()
         self.log(f"Found {len(assets)} delivery assets with randomized starting positions:")
         for asset in assets:
             self.log(f"  - {asset['name']} at location: {asset['current_location']}")
         
-        # Create tasks for parallel execution
-        tasks = []
-        
-        # Start WebSocket monitoring
-        tasks.append(asyncio.create_task(self.websocket_monitor()))
-        
         # Simulate asset movements (limit active movement simulations)
-        moving_assets = random.sample(assets, min(4, len(assets)))  # Random selection of assets to move
-        for asset in moving_assets:
-            tasks.append(asyncio.create_task(
-                self.simulate_asset_movement(asset, duration)
-            ))
+        moving_assets = self.rng.sample(assets, min(4, len(assets)))  # Random selection of assets to move
         
         # Simulate orders with variable rate
-        total_orders = random.randint(8, 15)  # Random number of orders
-        tasks.append(asyncio.create_task(
-            self.simulate_orders(num_orders=total_orders, interval=25)
-        ))
+        total_orders = self.rng.randint(8, 15)  # Random number of orders
         
-        # Wait for simulation to complete
-        await asyncio.sleep(duration)
+        coroutines = [
+            self.websocket_monitor(),  # Start WebSocket monitoring
+            self.flush_location_updates(),  # Send asset moves in batches
+            *(self.simulate_asset_movement(asset, duration) for asset in moving_assets),
+            self.simulate_orders(num_orders=total_orders, interval=25),
+        ]
         
-        # Cancel remaining tasks
-        for task in tasks:
-            task.cancel()
+        if sys.version_info >= (3, 11):
+            # The group cancels every task when the stop timer fires and surfaces real failures
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for coroutine in coroutines:
+                        tg.create_task(coroutine)
+                    tg.create_task(_stop_after(duration))
+            except BaseExceptionGroup as eg:
+                _, failures = eg.split(_StopSimulation)
+                if failures is not None:
+                    raise failures
+        else:
+            tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+            
+            # Wait for simulation to complete
+            await asyncio.sleep(duration)
+            
+            # Cancel remaining tasks
+            for task in tasks:
+                task.cancel()
+        await self.http.aclose()
         
         self.log("Simulation completed")
         
@@ -385,6 +597,20 @@ class GolfCourseSimulator:
 
 async def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Simulate orders and asset movements")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the full payload of every WebSocket update"
+    )
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        format="[%(asctime)s] [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    
     simulator = GolfCourseSimulator()
     
     # Run simulation for 5 minutes (can be adjusted)
@@ -406,4 +632,10 @@ if __name__ == "__main__":
     ╚════════════════════════════════════════════╝
     """)
     
+    # uvloop is optional; it speeds up the socket-heavy event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -7,6 +7,7 @@ import asyncio
 import json
 import signal
 import sys
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any
 
@@ -16,6 +17,17 @@ except ImportError:
     print("Please install websockets: pip install websockets")
     sys.exit(1)
 
+try:
+    import orjson
+    json_loads = orjson.loads  # accepts bytes frames directly, no utf-8 decode
+except ImportError:
+    json_loads = json.loads
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 try:
     from rich.console import Console
     from rich.table import Table
@@ -29,16 +41,31 @@ except ImportError:
 
 # Configuration
 WS_URL = "ws://localhost:8000/ws"
+EVENT_HISTORY = 1000  # Events kept in memory; older ones are evicted
+DASHBOARD_ROWS = 10  # Recent events shown on the dashboard
+RECONNECT_MIN_DELAY = 1  # Seconds before the first reconnect attempt
+RECONNECT_MAX_DELAY = 30  # Cap for the exponential reconnect backoff
 
 class WebSocketMonitor:
     """Monitor WebSocket events from the Golf Course Delivery System"""
     
     def __init__(self):
         self.console = Console() if USE_RICH else None
-        self.events = []
+        self.events = deque(maxlen=EVENT_HISTORY)
+        self.dashboard_rows = deque(maxlen=DASHBOARD_ROWS)  # Preformatted (time, type, details)
+        self.event_count = 0
         self.orders = {}
         self.assets = {}
         self.running = True
+        self.layout = self._build_layout() if USE_RICH else None
+        # Event type -> handler, so each message costs one dict lookup
+        self._handlers = {
+            "new_order": self._on_new_order,
+            "order_dispatched": self._on_dispatched,
+            "location_update": self._on_location,
+            "status_update": self._on_status,
+            "order_completed": self._on_completed,
+        }
         
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
@@ -59,61 +86,73 @@ class WebSocketMonitor:
     def handle_event(self, data: Dict[str, Any]):
         """Handle incoming WebSocket event"""
         event_type = data.get("type", "unknown")
-        timestamp = data.get("timestamp", datetime.now().isoformat())
+        if event_type == "batch":
+            # Several events coalesced into one frame by the server
+            for event in data.get("events", []):
+                self.handle_event(event)
+            return
+        # Local time the event arrived; the server's own timestamp is UTC and stays in the data
+        received = datetime.now()
         
+        # Format the display row once here rather than on every dashboard refresh
+        time_str = received.strftime("%H:%M:%S")
         self.events.append({
-            "time": timestamp,
+            "time": received.isoformat(),
+            "time_str": time_str,
             "type": event_type,
             "data": data
         })
+        self.dashboard_rows.append((time_str, event_type, str(data)[:50] + "..."))
+        self.event_count += 1
         
         # Handle specific event types
-        if event_type == "new_order":
-            order = data.get("order", {})
-            self.orders[order.get("order_id")] = order
-            self.log(f"New order {order.get('order_id')} at hole {order.get('hole_number')}", "SUCCESS")
-            
-        elif event_type == "order_dispatched":
-            dispatch = data.get("dispatch", {})
-            order_id = dispatch.get("order_id")
-            if order_id in self.orders:
-                self.orders[order_id]["status"] = "dispatched"
-                self.orders[order_id]["asset"] = dispatch.get("asset_name")
-            self.log(
-                f"Order {order_id} dispatched to {dispatch.get('asset_name')} "
-                f"(ETA: {dispatch.get('eta_minutes', 0):.1f} min)", 
-                "SUCCESS"
-            )
-            
-        elif event_type == "location_update":
-            asset_id = data.get("asset_id")
-            location = data.get("location")
-            if asset_id:
-                if asset_id not in self.assets:
-                    self.assets[asset_id] = {}
-                self.assets[asset_id]["location"] = location
-            self.log(f"Asset {asset_id} moved to {location}", "INFO")
-            
-        elif event_type == "status_update":
-            asset_id = data.get("asset_id")
-            status = data.get("status")
-            if asset_id:
-                if asset_id not in self.assets:
-                    self.assets[asset_id] = {}
-                self.assets[asset_id]["status"] = status
-            self.log(f"Asset {asset_id} status changed to {status}", "INFO")
-            
-        elif event_type == "order_completed":
-            order_id = data.get("order_id")
-            if order_id in self.orders:
-                self.orders[order_id]["status"] = "completed"
-            self.log(f"Order {order_id} completed", "SUCCESS")
+        handler = self._handlers.get(event_type)
+        if handler is not None:
+            handler(data)
     
-    def display_dashboard(self):
-        """Display a live dashboard (if rich is installed)"""
-        if not USE_RICH or not self.console:
-            return
-            
+    def _on_new_order(self, data: Dict[str, Any]):
+        order = data.get("order", {})
+        self.orders[order.get("order_id")] = order
+        self.log(f"New order {order.get('order_id')} at hole {order.get('hole_number')}", "SUCCESS")
+    
+    def _on_dispatched(self, data: Dict[str, Any]):
+        dispatch = data.get("dispatch", {})
+        order_id = dispatch.get("order_id")
+        if order_id in self.orders:
+            self.orders[order_id]["status"] = "dispatched"
+            self.orders[order_id]["asset"] = dispatch.get("asset_name")
+        self.log(
+            f"Order {order_id} dispatched to {dispatch.get('asset_name')} "
+            f"(ETA: {dispatch.get('eta_minutes', 0):.1f} min)", 
+            "SUCCESS"
+        )
+    
+    def _on_location(self, data: Dict[str, Any]):
+        asset_id = data.get("asset_id")
+        location = data.get("location")
+        if asset_id:
+            if asset_id not in self.assets:
+                self.assets[asset_id] = {}
+            self.assets[asset_id]["location"] = location
+        self.log(f"Asset {asset_id} moved to {location}", "INFO")
+    
+    def _on_status(self, data: Dict[str, Any]):
+        asset_id = data.get("asset_id")
+        status = data.get("status")
+        if asset_id:
+            if asset_id not in self.assets:
+                self.assets[asset_id] = {}
+            self.assets[asset_id]["status"] = status
+        self.log(f"Asset {asset_id} status changed to {status}", "INFO")
+    
+    def _on_completed(self, data: Dict[str, Any]):
+        order_id = data.get("order_id")
+        if order_id in self.orders:
+            self.orders[order_id]["status"] = "completed"
+        self.log(f"Order {order_id} completed", "SUCCESS")
+    
+    def _build_layout(self):
+        """Build the dashboard layout and its static header once"""
         layout = Layout()
         layout.split_column(
             Layout(name="header", size=3),
@@ -128,6 +167,15 @@ class WebSocketMonitor:
             style="blue"
         )
         layout["header"].update(header)
+        return layout
+    
+    def display_dashboard(self):
+        """Display a live dashboard (if rich is installed)
+        
+        Called by ``Live`` on each refresh, so only the parts that change are rebuilt.
+        """
+        if not USE_RICH or not self.console:
+            return
         
         # Main content - Recent events
         events_table = Table(title="Recent Events", show_header=True)
@@ -135,49 +183,68 @@ class WebSocketMonitor:
         events_table.add_column("Type", style="green")
         events_table.add_column("Details", style="white")
         
-        # Show last 10 events
-        for event in self.events[-10:]:
-            time_str = datetime.fromisoformat(event["time"]).strftime("%H:%M:%S")
-            events_table.add_row(
-                time_str,
-                event["type"],
-                str(event["data"])[:50] + "..."
-            )
+        for row in self.dashboard_rows:
+            events_table.add_row(*row)
         
-        layout["main"].update(events_table)
+        self.layout["main"].update(events_table)
         
         # Footer
         footer = Panel(
-            f"Connected to: {WS_URL} | Events: {len(self.events)} | "
+            f"Connected to: {WS_URL} | Events: {self.event_count} | "
             f"Orders: {len(self.orders)} | Press Ctrl+C to exit",
             style="dim"
         )
-        layout["footer"].update(footer)
+        self.layout["footer"].update(footer)
         
-        return layout
+        return self.layout
     
     async def connect_and_monitor(self):
-        """Connect to WebSocket and monitor events"""
-        self.log(f"Connecting to {WS_URL}...", "INFO")
+        """Connect to WebSocket and monitor events, reconnecting with backoff when dropped"""
+        backoff = RECONNECT_MIN_DELAY
+        # Binary msgpack frames skip the UTF-8 validation text frames go through
+        subprotocols = ["msgpack"] if msgpack is not None else None
         
-        try:
-            async with websockets.connect(WS_URL) as websocket:
-                self.log("Connected successfully!", "SUCCESS")
-                
-                # Handle incoming messages
-                async for message in websocket:
-                    try:
-                        data = json.loads(message)
-                        self.handle_event(data)
-                    except json.JSONDecodeError:
-                        self.log(f"Invalid JSON received: {message}", "ERROR")
-                    except Exception as e:
-                        self.log(f"Error handling message: {e}", "ERROR")
-                        
-        except websockets.exceptions.WebSocketException as e:
-            self.log(f"WebSocket error: {e}", "ERROR")
-        except Exception as e:
-            self.log(f"Connection error: {e}", "ERROR")
+        while self.running:
+            self.log(f"Connecting to {WS_URL}...", "INFO")
+            
+            try:
+                async with websockets.connect(
+                    WS_URL,
+                    max_size=2**20,
+                    max_queue=128,  # Bound buffered frames if rendering falls behind
+                    compression=None,  # Small frames; deflate costs more CPU than it saves
+                    ping_interval=20,
+                    ping_timeout=20,
+                    subprotocols=subprotocols
+                ) as websocket:
+                    self.log("Connected successfully!", "SUCCESS")
+                    backoff = RECONNECT_MIN_DELAY
+                    
+                    # Handle incoming messages
+                    async for message in websocket:
+                        try:
+                            if isinstance(message, bytes):
+                                data = msgpack.unpackb(message, raw=False)
+                            else:
+                                data = json_loads(message)
+                            self.handle_event(data)
+                        except json.JSONDecodeError:
+                            self.log(f"Invalid JSON received: {message}", "ERROR")
+                        except Exception as e:
+                            self.log(f"Error handling message: {e}", "ERROR")
+                    
+                    self.log("Connection closed by server", "WARNING")
+                            
+            except websockets.exceptions.WebSocketException as e:
+                self.log(f"WebSocket error: {e}", "ERROR")
+            except Exception as e:
+                self.log(f"Connection error: {e}", "ERROR")
+            
+            if not self.running:
+                break
+            self.log(f"Reconnecting in {backoff}s...", "WARNING")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RECONNECT_MAX_DELAY)
     
     def signal_handler(self, signum, frame):
         """Handle shutdown signals"""
@@ -191,8 +258,12 @@ class WebSocketMonitor:
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
         
-        # Start monitoring
-        await self.connect_and_monitor()
+        # Start monitoring, redrawing the dashboard at a fixed rate rather than per event
+        if USE_RICH and self.console:
+            with Live(get_renderable=self.display_dashboard, console=self.console, refresh_per_second=4):
+                await self.connect_and_monitor()
+        else:
+            await self.connect_and_monitor()
 
 
 async def main():
@@ -216,4 +287,10 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop is optional; it speeds up the socket-heavy event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -3,30 +3,48 @@ FastAPI application for Golf Course Delivery System
 """
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from typing import List, Optional
+from typing import Dict, List, Optional
 import asyncio
+import itertools
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 import random
+import time
 
 from ..models import Order, OrderStatus, AssetStatus, BeverageCart, DeliveryStaff
 from ..dispatcher import Dispatcher
 from .models import (
     OrderRequest, OrderResponse, AssetResponse, 
-    DispatchResponse, AssetLocation, AssetStatusUpdate
+    DispatchResponse, AssetLocation, AssetStatusUpdate,
+    BulkDispatchRequest, BulkLocationRequest
 )
 from .database import get_db, init_db
-from .websocket_manager import ConnectionManager
+from .websocket_manager import BroadcastBuffer, ConnectionManager
 from prometheus_fastapi_instrumentator import Instrumentator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed"""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+
 # WebSocket manager for real-time updates
 manager = ConnectionManager()
+broadcaster = BroadcastBuffer(manager)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,13 +54,15 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down Golf Course Delivery API...")
+    await broadcaster.close()
 
 # Create FastAPI app
 app = FastAPI(
     title="Golf Course Delivery System",
     description="API for managing on-course food and beverage deliveries",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -57,21 +77,39 @@ app.add_middleware(
 # Add Prometheus metrics
 Instrumentator().instrument(app).expose(app)
 
+# Realistic starting locations for the default assets
+FRONT_NINE = tuple(range(1, 10))  # Holes 1-9
+BACK_NINE = tuple(range(10, 19))  # Holes 10-18
+ALL_LOCATIONS = ("clubhouse",) + tuple(range(1, 19))  # All possible locations
+STAFF1_LOCATIONS = ("clubhouse",) + ALL_LOCATIONS  # Higher chance of clubhouse
+
 # In-memory storage (will be replaced with database)
-assets: List[AssetResponse] = []
-orders: List[OrderResponse] = []
+# Keyed by ID for constant-time lookup from the endpoints
+assets: Dict[str, AssetResponse] = {}
+orders: Dict[str, OrderResponse] = {}
+# Order IDs come from a counter so concurrent requests never mint the same one
+_order_seq = itertools.count(1)
 dispatcher: Optional[Dispatcher] = None
 
+# Broadcast timestamps have one-second resolution, so format each second once
+_last_ts_sec = 0
+_last_ts_str = ""
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO string, cached for the current second"""
+    global _last_ts_sec, _last_ts_str
+    now_sec = int(time.time())
+    if now_sec != _last_ts_sec:
+        _last_ts_sec = now_sec
+        # Naive, so the string keeps its old format without a UTC offset
+        _last_ts_str = datetime.fromtimestamp(now_sec, timezone.utc).replace(tzinfo=None).isoformat()
+    return _last_ts_str
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the system with default assets"""
     global assets, dispatcher
     
-    # Define realistic starting locations
-    front_nine_holes = list(range(1, 10))  # Holes 1-9
-    back_nine_holes = list(range(10, 19))  # Holes 10-18
-    all_locations = ["clubhouse"] + list(range(1, 19))  # All possible locations
-    
     # Initialize assets with random realistic starting positions
     default_assets = [
         # Cart 1 - restricted to front 9, random starting hole
@@ -79,36 +117,36 @@ async def startup_event():
             asset_id="cart1", 
             name="Reese", 
             loop="front_9", 
-            current_location=random.choice(front_nine_holes)
+            current_location=random.choice(FRONT_NINE)
         ),
         # Cart 2 - restricted to back 9, random starting hole
         BeverageCart(
             asset_id="cart2", 
             name="Bev-Cart 2", 
             loop="back_9", 
-            current_location=random.choice(back_nine_holes)
+            current_location=random.choice(BACK_NINE)
         ),
         # Staff 1 - can be anywhere, higher chance of clubhouse
         DeliveryStaff(
             asset_id="staff1", 
             name="Esteban", 
-            current_location=random.choice(["clubhouse", "clubhouse"] + list(range(1, 19)))
+            current_location=random.choice(STAFF1_LOCATIONS)
         ),
         # Staff 2 - can be anywhere
         DeliveryStaff(
             asset_id="staff2", 
             name="Dylan", 
-            current_location=random.choice(all_locations)
+            current_location=random.choice(ALL_LOCATIONS)
         ),
         # Staff 3 - can be anywhere
         DeliveryStaff(
             asset_id="staff3", 
             name="Paige", 
-            current_location=random.choice(all_locations)
+            current_location=random.choice(ALL_LOCATIONS)
         )
     ]
     
-    assets = [AssetResponse.from_model(asset) for asset in default_assets]
+    assets = {asset.asset_id: AssetResponse.from_model(asset) for asset in default_assets}
     dispatcher = Dispatcher(default_assets)
     
     # Log initial positions
@@ -128,31 +166,44 @@ async def root():
 @app.get("/api/assets", response_model=List[AssetResponse])
 async def get_assets():
     """Get all delivery assets and their current status"""
-    return assets
+    return list(assets.values())
 
 @app.get("/api/assets/{asset_id}", response_model=AssetResponse)
 async def get_asset(asset_id: str):
     """Get a specific asset by ID"""
-    asset = next((a for a in assets if a.asset_id == asset_id), None)
+    asset = assets.get(asset_id)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     return asset
 
+@app.post("/api/assets/locations", response_model=List[AssetResponse])
+async def update_asset_locations(bulk_request: BulkLocationRequest):
+    """Update several asset locations in a single request, skipping unknown assets"""
+    updated = []
+    for update in bulk_request.updates:
+        try:
+            updated.append(await update_asset_location(
+                update.asset_id, AssetLocation(location=update.location)
+            ))
+        except HTTPException as e:
+            logger.warning(f"Bulk location update skipped asset {update.asset_id}: {e.detail}")
+    return updated
+
 @app.post("/api/assets/{asset_id}/location", response_model=AssetResponse)
 async def update_asset_location(asset_id: str, location: AssetLocation):
     """Update an asset's location"""
-    asset = next((a for a in assets if a.asset_id == asset_id), None)
+    asset = assets.get(asset_id)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     
     asset.current_location = location.location
     
     # Broadcast location update via WebSocket
-    await manager.broadcast({
+    broadcaster.emit({
         "type": "location_update",
         "asset_id": asset_id,
         "location": location.location,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     })
     
     return asset
@@ -160,18 +211,18 @@ async def update_asset_location(asset_id: str, location: AssetLocation):
 @app.post("/api/assets/{asset_id}/status", response_model=AssetResponse)
 async def update_asset_status(asset_id: str, status_update: AssetStatusUpdate):
     """Update an asset's status"""
-    asset = next((a for a in assets if a.asset_id == asset_id), None)
+    asset = assets.get(asset_id)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     
     asset.status = status_update.status
     
     # Broadcast status update via WebSocket
-    await manager.broadcast({
+    broadcaster.emit({
         "type": "status_update",
         "asset_id": asset_id,
-        "status": status_update.status,
-        "timestamp": datetime.utcnow().isoformat()
+        "status": status_update.status.value,
+        "timestamp": _now_iso()
     })
     
     return asset
@@ -179,12 +230,12 @@ async def update_asset_status(asset_id: str, status_update: AssetStatusUpdate):
 @app.get("/api/orders", response_model=List[OrderResponse])
 async def get_orders():
     """Get all orders"""
-    return orders
+    return list(orders.values())
 
 @app.get("/api/orders/{order_id}", response_model=OrderResponse)
 async def get_order(order_id: str):
     """Get a specific order by ID"""
-    order = next((o for o in orders if o.order_id == order_id), None)
+    order = orders.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -194,30 +245,46 @@ async def create_order(order_request: OrderRequest):
     """Create a new order"""
     # Create order
     order = Order(
-        order_id=f"ORD{len(orders) + 1:04d}",
+        order_id=f"ORD{next(_order_seq):04d}",
         hole_number=order_request.hole_number
     )
     
     order_response = OrderResponse.from_model(order)
-    orders.append(order_response)
+    orders[order_response.order_id] = order_response
     
     # Broadcast new order via WebSocket
-    await manager.broadcast({
+    broadcaster.emit({
         "type": "new_order",
-        "order": order_response.dict(),
-        "timestamp": datetime.utcnow().isoformat()
+        "order": order_response.model_dump(mode="json"),
+        "timestamp": _now_iso()
     })
     
     logger.info(f"Created order {order.order_id} for hole {order.hole_number}")
     return order_response
 
+@app.post("/api/orders/bulk", response_model=List[OrderResponse])
+async def create_orders_bulk(order_requests: List[OrderRequest]):
+    """Create several orders in a single request"""
+    return [await create_order(order_request) for order_request in order_requests]
+
+@app.post("/api/orders/dispatch", response_model=List[DispatchResponse])
+async def dispatch_orders_bulk(bulk_request: BulkDispatchRequest):
+    """Dispatch several orders in a single request, skipping any that fail"""
+    dispatched = []
+    for order_id in bulk_request.order_ids:
+        try:
+            dispatched.append(await dispatch_order(order_id))
+        except HTTPException as e:
+            logger.warning(f"Bulk dispatch skipped order {order_id}: {e.detail}")
+    return dispatched
+
 @app.post("/api/orders/{order_id}/dispatch", response_model=DispatchResponse)
 async def dispatch_order(order_id: str):
     """Dispatch an order to the best available asset"""
     global dispatcher
     
     # Find the order
-    order_response = next((o for o in orders if o.order_id == order_id), None)
+    order_response = orders.get(order_id)
     if not order_response:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -251,24 +318,26 @@ async def dispatch_order(order_id: str):
         order
     )
     
-    dispatch_response = DispatchResponse(
+    # Fields come from our own models, so skip validation; coerce the numbers the
+    # dispatcher may hand back as NumPy scalars
+    dispatch_response = DispatchResponse.model_construct(
         order_id=order_id,
         asset_id=assigned_asset.asset_id,
         asset_name=assigned_asset.name,
-        eta_minutes=eta,
-        predicted_delivery_hole=predicted_hole
+        eta_minutes=float(eta),
+        predicted_delivery_hole=int(predicted_hole)
     )
     
     # Update asset status
-    asset_response = next(a for a in assets if a.asset_id == assigned_asset.asset_id)
+    asset_response = assets[assigned_asset.asset_id]
     asset_response.status = AssetStatus.ON_DELIVERY
     asset_response.current_orders.append(order_id)
     
     # Broadcast dispatch via WebSocket
-    await manager.broadcast({
+    broadcaster.emit({
         "type": "order_dispatched",
-        "dispatch": dispatch_response.dict(),
-        "timestamp": datetime.utcnow().isoformat()
+        "dispatch": dispatch_response.model_dump(),  # primitives only, no JSON coercion needed
+        "timestamp": _now_iso()
     })
     
     logger.info(f"Dispatched order {order_id} to {assigned_asset.name}")
@@ -278,7 +347,7 @@ async def dispatch_order(order_id: str):
 async def complete_order(order_id: str):
     """Mark an order as completed"""
     # Find the order
-    order_response = next((o for o in orders if o.order_id == order_id), None)
+    order_response = orders.get(order_id)
     if not order_response:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -290,17 +359,24 @@ async def complete_order(order_id: str):
     
     # Update asset status
     if order_response.assigned_to_id:
-        asset = next((a for a in assets if a.asset_id == order_response.assigned_to_id), None)
+        asset = assets.get(order_response.assigned_to_id)
         if asset:
             asset.current_orders.remove(order_id)
             if not asset.current_orders:
                 asset.status = AssetStatus.AVAILABLE
-    
+                # Clients tracking asset state from dispatch events need the reset too
+                broadcaster.emit({
+                    "type": "status_update",
+                    "asset_id": asset.asset_id,
+                    "status": asset.status.value,
+                    "timestamp": _now_iso()
+                })
+
     # Broadcast completion via WebSocket
-    await manager.broadcast({
+    broadcaster.emit({
         "type": "order_completed",
         "order_id": order_id,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     })
     
     logger.info(f"Order {order_id} completed")
@@ -319,4 +395,10 @@ async def websocket_endpoint(websocket: WebSocket):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Update frames are small JSON; per-message deflate costs more CPU than it saves.
+    # uvloop and httptools come with uvicorn[standard].
+    uvicorn.run(
+        app, host="0.0.0.0", port=8000,
+        loop="uvloop", http="httptools", ws="websockets",
+        ws_per_message_deflate=False
+    )
\ No newline at end of file
@@ -1,10 +1,11 @@
 """
 Database configuration and models for persistent storage
 """
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Enum, Float, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, DateTime, Enum, Float, ForeignKey, JSON
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import relationship
+from sqlalchemy.pool import NullPool
 import os
 from datetime import datetime
 from decouple import config
@@ -12,25 +13,35 @@ from decouple import config
 # Database configuration
 DATABASE_URL = config("DATABASE_URL", default="sqlite:///./golf_delivery.db")
 
+# asyncio drivers for URLs that don't name one (DATABASE_URL stays usable by alembic)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def get_async_url(url: str) -> str:
+    """Return the database URL with an asyncio driver selected"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
 # Create engine lazily to avoid connection during imports
 engine = None
 
 def get_engine():
-    """Get or create the database engine"""
+    """Get or create the async database engine"""
     global engine
     if engine is None:
-        if DATABASE_URL.startswith("sqlite"):
-            engine = create_engine(
-                DATABASE_URL,
-                connect_args={"check_same_thread": False},
-                poolclass=StaticPool
-            )
+        url = get_async_url(DATABASE_URL)
+        if url.startswith("sqlite"):
+            # aiosqlite gives each connection its own thread; opening one per session is cheap
+            engine = create_async_engine(url, poolclass=NullPool)
         else:
-            engine = create_engine(DATABASE_URL)
+            engine = create_async_engine(url, pool_pre_ping=True)
     return engine
 
 # Create session factory (will bind to engine when needed)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+SessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
 
 # Create base
 Base = declarative_base()
@@ -85,15 +96,13 @@ class DBDeliveryMetric(Base):
 # Database initialization
 async def init_db():
     """Initialize database tables"""
-    Base.metadata.create_all(bind=get_engine())
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
 # Dependency
-def get_db():
+async def get_db():
     """Get database session"""
     # Bind the session to engine only when needed
     SessionLocal.configure(bind=get_engine())
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+    async with SessionLocal() as db:
+        yield db
\ No newline at end of file
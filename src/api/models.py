@@ -12,10 +12,23 @@ class OrderRequest(BaseModel):
     items: Optional[List[str]] = Field(default=[], description="List of items ordered")
     special_instructions: Optional[str] = None
 
+class BulkDispatchRequest(BaseModel):
+    """Request model for dispatching several orders in one call"""
+    order_ids: List[str] = Field(..., description="IDs of the orders to dispatch")
+
 class AssetLocation(BaseModel):
     """Request model for updating asset location"""
     location: Union[int, str] = Field(..., description="Current location (hole number or 'clubhouse')")
 
+class AssetLocationUpdate(BaseModel):
+    """Location update for one asset within a bulk request"""
+    asset_id: str
+    location: Union[int, str] = Field(..., description="Current location (hole number or 'clubhouse')")
+
+class BulkLocationRequest(BaseModel):
+    """Request model for updating several asset locations in one call"""
+    updates: List[AssetLocationUpdate] = Field(..., description="Location updates to apply in order")
+
 class AssetStatusUpdate(BaseModel):
     """Request model for updating asset status"""
     status: AssetStatus
@@ -32,9 +45,9 @@ class AssetResponse(BaseModel):
 
     @classmethod
     def from_model(cls, asset: Union[BeverageCart, DeliveryStaff]) -> 'AssetResponse':
-        """Create response from domain model"""
+        """Create response from domain model (trusted data, so validation is skipped)"""
         asset_type = "beverage_cart" if isinstance(asset, BeverageCart) else "delivery_staff"
-        return cls(
+        return cls.model_construct(
             asset_id=asset.asset_id,
             name=asset.name,
             asset_type=asset_type,
@@ -56,8 +69,8 @@ class OrderResponse(BaseModel):
 
     @classmethod
     def from_model(cls, order: Order) -> 'OrderResponse':
-        """Create response from domain model"""
-        return cls(
+        """Create response from domain model (trusted data, so validation is skipped)"""
+        return cls.model_construct(
             order_id=order.order_id,
             hole_number=order.hole_number,
             status=order.status,
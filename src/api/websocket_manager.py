@@ -1,49 +1,158 @@
 """
 WebSocket connection manager for real-time updates
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Union
 from fastapi import WebSocket
+import asyncio
 import json
 import logging
 
+try:
+    import orjson
+    json_loads = orjson.loads
+    def encode_message(message: Dict[Any, Any]) -> bytes:
+        """Encode an event as a JSON frame"""
+        return orjson.dumps(message)
+except ImportError:
+    json_loads = json.loads
+    def encode_message(message: Dict[Any, Any]) -> bytes:
+        """Encode an event as a JSON frame"""
+        return json.dumps(message).encode()
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
+# Clients that offer this subprotocol receive binary msgpack frames instead of JSON text
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+# Frames buffered per client before new broadcasts are dropped for it
+SEND_QUEUE_SIZE = 100
+
+# Events emitted within this many seconds of each other share one frame
+COALESCE_WINDOW = 0.01
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates"""
     
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.binary_connections: Set[WebSocket] = set()
+        # One bounded queue and one long-lived writer task per connection
+        self.send_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.writers: Dict[WebSocket, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket):
         """Accept and store a new WebSocket connection"""
-        await websocket.accept()
+        if msgpack is not None and MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+            self.binary_connections.add(websocket)
+        else:
+            await websocket.accept()
         self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.send_queues[websocket] = queue
+        self.writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
         logger.info(f"New WebSocket connection. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection"""
+        if websocket not in self.active_connections:
+            return
         self.active_connections.remove(websocket)
+        self.binary_connections.discard(websocket)
+        self.send_queues.pop(websocket, None)
+        writer = self.writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued frames to one client in order until it goes away"""
+        while True:
+            frame = await queue.get()
+            try:
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+            except Exception as e:
+                logger.error(f"Error broadcasting to connection: {e}")
+                self.disconnect(websocket)
+                return
+    
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send a message to a specific WebSocket connection"""
         await websocket.send_text(message)
     
-    async def broadcast(self, message: Dict[Any, Any]):
-        """Broadcast a message to all connected WebSocket clients"""
+    async def broadcast(self, message: Union[Dict[Any, Any], bytes]):
+        """Broadcast a message to all connected WebSocket clients
+
+        ``message`` is either an event dict or an already JSON-encoded frame.
+        Frames are queued for each client's writer; a client whose queue is
+        full misses the frame rather than stalling the broadcast.
+        """
         if not self.active_connections:
             return
         
-        message_json = json.dumps(message)
-        disconnected = []
+        # Serialize once and queue the same frame for every client
+        if isinstance(message, bytes):
+            message_json = message.decode()
+            if self.binary_connections:
+                message = json_loads(message)
+        else:
+            message_json = encode_message(message).decode()
+        message_packed = msgpack.packb(message) if self.binary_connections else None
         
-        for connection in self.active_connections:
+        for connection, queue in self.send_queues.items():
+            frame = message_packed if connection in self.binary_connections else message_json
             try:
-                await connection.send_text(message_json)
-            except Exception as e:
-                logger.error(f"Error broadcasting to connection: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected connections
-        for connection in disconnected:
-            self.disconnect(connection)
\ No newline at end of file
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning("WebSocket client is falling behind; dropping broadcast frame")
+
+
+class BroadcastBuffer:
+    """Coalesces events emitted close together into a single broadcast frame
+    
+    A lone event is sent as-is; several events go out as one
+    ``{"type": "batch", "events": [...]}`` frame.
+    """
+    
+    def __init__(self, manager: ConnectionManager, window: float = COALESCE_WINDOW):
+        self.manager = manager
+        self.window = window
+        self.pending: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def emit(self, event: Dict[str, Any]):
+        """Queue an event for the next frame without waiting for it to be sent"""
+        if not self.manager.active_connections:
+            return
+        self.pending.append(event)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self):
+        """Wait out the coalescing window, then send everything gathered in it"""
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        await self.flush()
+    
+    async def close(self):
+        """Send anything still pending without waiting out the window, e.g. on shutdown"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+    
+    async def flush(self):
+        """Broadcast the pending events now"""
+        batch, self.pending = self.pending, []
+        if len(batch) == 1:
+            await self.manager.broadcast(batch[0])
+        elif batch:
+            await self.manager.broadcast({"type": "batch", "events": batch})
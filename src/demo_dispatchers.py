@@ -1,6 +1,7 @@
 """
 Demo script showing how to use different dispatch strategies.
 """
+import logging
 from .models import BeverageCart, DeliveryStaff, Order, AssetStatus
 from .simulator import GolfCourseSimulator
 from .dispatcher_strategies import SimpleDispatcher
@@ -82,4 +83,5 @@ def run_dispatcher_comparison():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     run_dispatcher_comparison()
\ No newline at end of file
@@ -1,19 +1,37 @@
 """
 Core dispatcher system that uses pluggable strategies.
 """
+import heapq
+import itertools
+import logging
 import math
+import os
 import random
-from typing import Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy is optional; fall back to a greedy assignment
+    linear_sum_assignment = None
+
 from .course_data import COURSE_DATA
-from .models import BeverageCart, DeliveryStaff, Order, AssetStatus, OrderStatus
+from .models import Order, AssetStatus, OrderStatus, CART_KIND
 from .simulation import AssetSimulator
 from .prediction_service import PredictionService
-from .dispatcher_strategies import DispatchStrategy, SimpleDispatcher
+from .dispatcher_strategies import (
+    DispatchStrategy, PLAYER_MIN_PER_HOLE, PREP_TIME_MIN, BEV_CART_PREFERENCE_MIN,
+)
 
-# --- CONSTANTS ---
-PLAYER_MIN_PER_HOLE = 15  # Average time a player takes to complete a hole
-PREP_TIME_MIN = 10  # Default prep time
-BEV_CART_PREFERENCE_MIN = 10  # Preference window for beverage carts
+logger = logging.getLogger(__name__)
+
+# Enum members are singletons, so hot loops compare status by identity against these
+# aliases instead of going through == and the Enum class attribute lookup
+_IDLE = AssetStatus.IDLE
+_PENDING = OrderStatus.PENDING
 
 # --- BATCHING CONSTANTS ---
 MAX_BATCH_SIZE = 3  # Maximum number of orders in a batch
@@ -21,6 +39,94 @@ ADJACENT_HOLE_THRESHOLD = 2  # Orders within this many holes are considered adja
 BATCH_DELIVERY_TIME_PENALTY = 2  # Additional minutes per extra order in a batch
 BATCH_EFFICIENCY_BONUS = 0.85  # Efficiency multiplier for batched orders (15% reduction in total time)
 
+# --- ZONE CONSTANTS ---
+ALL_HOLES_MASK = -1  # Zone mask for assets that can serve any hole (all bits set)
+
+# --- ASSIGNMENT CONSTANTS ---
+INELIGIBLE_COST = 1e9  # Cost for order/asset pairs that cannot be assigned (solver needs finite costs)
+
+
+def _greedy_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Assigns the cheapest remaining order/asset pair until rows or columns run out."""
+    cost = cost.astype(float, copy=True)
+    rows, cols = [], []
+    for _ in range(min(cost.shape)):
+        row, col = np.unravel_index(np.argmin(cost), cost.shape)
+        rows.append(row)
+        cols.append(col)
+        cost[row, :] = np.inf
+        cost[:, col] = np.inf
+    return np.array(rows, dtype=int), np.array(cols, dtype=int)
+
+
+def _auction_assignment(cost: np.ndarray, epsilon: Optional[float] = None,
+                        max_rounds: int = 100_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bertsekas auction algorithm (Jacobi variant): every unassigned row bids on its best
+    column at once, raising that column's price by the margin over its second-best
+    choice plus epsilon.
+
+    Non-finite costs mark pairs that cannot be assigned. Each row also gets a private
+    "unassigned" column, costlier than leaving any other row unassigned, so a row that is
+    outbid everywhere settles there and prices stay bounded by the cost range instead of
+    climbing towards a sentinel cost. The result is within rows * epsilon (default
+    1 / (rows + 1)) of the optimal total cost among assignments that place the most rows.
+    If max_rounds of bidding are not enough, the greedy assignment is used instead.
+
+    Returns (row indices, column indices) of the rows that were assigned, by row.
+    """
+    cost = np.asarray(cost, dtype=float)
+    n_rows, n_cols = cost.shape
+    allowed = np.isfinite(cost)
+    if not allowed.any():
+        return np.array([], dtype=int), np.array([], dtype=int)
+    if epsilon is None:
+        epsilon = 1.0 / (n_rows + 1)
+
+    # Unassigned columns: row i may only take column n_cols + i
+    allowed_costs = cost[allowed]
+    spread = allowed_costs.max() - allowed_costs.min() + 1.0
+    unassigned_cost = allowed_costs.max() + n_rows * spread
+    benefit = np.full((n_rows, n_cols + n_rows), -np.inf)
+    benefit[:, :n_cols] = np.where(allowed, -cost, -np.inf)
+    benefit[np.arange(n_rows), n_cols + np.arange(n_rows)] = -unassigned_cost
+
+    prices = np.zeros(n_cols + n_rows)
+    owner = np.full(n_cols + n_rows, -1)
+    assigned = np.full(n_rows, -1)
+    rows_index = bidders = np.arange(n_rows)
+
+    for _ in range(max_rounds):
+        if not bidders.size:
+            break
+        values = benefit[bidders] - prices
+        top_two = np.argpartition(-values, 1, axis=1)[:, :2]
+        best = top_two[:, 0]
+        best_values = values[np.arange(bidders.size), best]
+        second_values = values[np.arange(bidders.size), top_two[:, 1]]
+        # A row whose only choice is its unassigned column never competes for it
+        increments = np.where(np.isfinite(second_values), best_values - second_values, 0.0)
+        bids = prices[best] + increments + epsilon
+
+        # Highest bid wins each column; the previous owner goes back to bidding
+        by_column = np.lexsort((bids, best))
+        winners = by_column[np.r_[best[by_column][1:] != best[by_column][:-1], True]]
+        columns = best[winners]
+        outbid = owner[columns]
+        assigned[outbid[outbid >= 0]] = -1
+        owner[columns] = bidders[winners]
+        assigned[bidders[winners]] = columns
+        prices[columns] = bids[winners]
+        bidders = np.flatnonzero(assigned < 0)
+    else:
+        if bidders.size:
+            logger.warning("Auction did not converge in %d rounds; using the greedy assignment.", max_rounds)
+            return _greedy_assignment(np.where(allowed, cost, INELIGIBLE_COST))
+
+    placed = assigned < n_cols
+    return rows_index[placed], assigned[placed]
+
+
 class Dispatcher:
     """Handles the logic for finding and assigning the best delivery candidate."""
 
@@ -28,9 +134,93 @@ class Dispatcher:
         self.assets = assets
         self.course_data = COURSE_DATA
         self.simulator = AssetSimulator()
-        self.pending_orders = []  # Store pending orders for batch evaluation
+        self._pending: Dict[str, Order] = {}  # Pending orders for batch evaluation, keyed by order_id
+        # Pending orders bucketed by hole: hole -> {order_id: (arrival seq, order)}
+        self._by_hole: Dict[int, Dict[str, Tuple[int, Order]]] = defaultdict(dict)
+        self._pending_seq = itertools.count()
+        # Predicted prep time per order_id, so every asset and batch in a round sees the same
+        # estimate; reset by begin_round() so orders that leave elsewhere are not kept
+        self._prep_cache: Dict[str, float] = {}
+        # Predicted travel time per (start, end, time of day), reset by begin_round()
+        self._tt_cache: Dict[tuple, float] = {}
+        # Acceptance chance per (asset_id, order_id), reset with the travel-time cache
+        self._acceptance_cache: Dict[Tuple[str, str], float] = {}
+        # Assignment solver used by the last dispatch_pending_batch call
+        self.last_batch_solver: Optional[str] = None
         self.prediction_service = PredictionService()
         self.strategy = strategy  # Optional pluggable strategy
+        # Hole bitmasks: bit h is set if hole h is in the zone. Any hole not on the front nine is on the back nine.
+        self._front9_mask = sum(1 << h for h in self.course_data["front_9_holes"])
+        self._cart_loop_mask = {"front_9": self._front9_mask, "back_9": ~self._front9_mask}
+
+    def begin_round(self):
+        """
+        Starts a new dispatch round by dropping the per-round prediction caches, so each
+        round draws fresh travel times, prep times and acceptance chances. find_best_candidate and
+        dispatch_pending_batch call this themselves; callers that score assets with
+        calculate_eta_and_destination directly should call it before each scoring pass.
+        """
+        self._tt_cache.clear()
+        self._prep_cache.clear()
+        self._acceptance_cache.clear()
+
+    @property
+    def pending_orders(self) -> tuple:
+        """
+        Pending orders in the order they were added, as a read-only snapshot.
+        Pending orders are indexed by id and hole, so change them only through
+        add_pending_order and remove_pending_order; the tuple cannot be mutated.
+        """
+        return tuple(self._pending.values())
+
+    def _prep_for(self, order: Order) -> float:
+        """Predicted prep time for an order, predicted once per dispatch round and then reused."""
+        prep_time = self._prep_cache.get(order.order_id)
+        if prep_time is None:
+            prep_time = self._prep_cache[order.order_id] = self.prediction_service.predict_order_prep_time(order)
+        return prep_time
+
+    def _tt(self, start_location, end_location, time_of_day: str) -> float:
+        """Predicted travel time between two locations, predicted once per dispatch round."""
+        key = (self._get_location_as_hole_num(start_location),
+               self._get_location_as_hole_num(end_location), time_of_day)
+        travel_time = self._tt_cache.get(key)
+        if travel_time is None:
+            travel_time = self._tt_cache[key] = self.prediction_service.predict_travel_time(
+                start_location, end_location, time_of_day
+            )
+        return travel_time
+
+    def _acceptance_for(self, asset, order: Order) -> float:
+        """Predicted acceptance chance for an asset/order pair, predicted once per dispatch round."""
+        key = (asset.asset_id, order.order_id)
+        acceptance_chance = self._acceptance_cache.get(key)
+        if acceptance_chance is None:
+            acceptance_chance = self._acceptance_cache[key] = \
+                self.prediction_service.predict_offer_acceptance_chance(asset, order)
+        return acceptance_chance
+
+    def _prefetch_predictions(self, assets: list, orders: list, time_of_day: str):
+        """
+        Fills the round's caches with the predictions every asset's scoring needs (each
+        asset to the clubhouse, the clubhouse to each order's hole, each order's prep time)
+        using one batched call per model. Anything not prefetched is predicted on demand.
+        """
+        routes = {}
+        legs = itertools.chain(((asset.current_location, 'clubhouse') for asset in assets),
+                               (('clubhouse', o.hole_number) for o in orders))
+        for start_location, end_location in legs:
+            key = (self._get_location_as_hole_num(start_location),
+                   self._get_location_as_hole_num(end_location), time_of_day)
+            if key not in self._tt_cache:
+                routes.setdefault(key, (start_location, end_location, time_of_day))
+        if routes:
+            self._tt_cache.update(zip(routes, self.prediction_service.predict_travel_times(list(routes.values()))))
+
+        unprepped = [o for o in orders if o.order_id not in self._prep_cache]
+        if unprepped:
+            self._prep_cache.update(zip((o.order_id for o in unprepped),
+                                        self.prediction_service.predict_order_prep_times(unprepped)))
 
     def _get_location_as_hole_num(self, location):
         """Converts location ('clubhouse' or hole number) to an integer."""
@@ -38,13 +228,40 @@ class Dispatcher:
             return 0
         return location
 
+    def _zone_mask(self, asset) -> int:
+        """Bitmask of the holes an asset may deliver to. Carts are limited to their loop."""
+        if asset.KIND == CART_KIND:
+            return self._cart_loop_mask.get(asset.loop, 0)
+        return ALL_HOLES_MASK
+
+    def _asset_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Snapshot the fleet as parallel arrays (idle flag, zone mask) for vectorized filtering.
+        Rebuilt once per dispatch round, a single pass over the fleet, because asset status
+        is changed outside the dispatcher and a cached snapshot could go stale.
+        """
+        n = len(self.assets)
+        idle = np.fromiter((a.status is _IDLE for a in self.assets), dtype=bool, count=n)
+        zones = np.fromiter((self._zone_mask(a) for a in self.assets), dtype=np.int64, count=n)
+        return idle, zones
+
     def identify_batchable_orders(self, order: Order, available_orders: Optional[list] = None):
         """
         Identifies orders that can be batched together based on proximity.
         Returns a list of orders that can be batched with the given order.
         """
         if available_orders is None:
-            available_orders = [o for o in self.pending_orders if o.status == OrderStatus.PENDING and o != order]
+            # Only the hole buckets within the threshold can hold batchable orders;
+            # merging them by arrival sequence keeps the pending order. The merge is
+            # consumed lazily, so it stops once the batch is full.
+            nearby = heapq.merge(*(
+                self._by_hole[hole].values()
+                for hole in range(order.hole_number - ADJACENT_HOLE_THRESHOLD,
+                                  order.hole_number + ADJACENT_HOLE_THRESHOLD + 1)
+                if hole in self._by_hole
+            ))
+            available_orders = (o for _, o in nearby
+                                if o.status is _PENDING and o.order_id != order.order_id)
         
         batchable_orders = [order]  # Always include the current order
         
@@ -70,37 +287,31 @@ class Dispatcher:
         if not orders:
             return float('inf'), []
         
-        asset_loc = self._get_location_as_hole_num(asset.current_location)
-        
         # Time to get to clubhouse for pickup using ML prediction
         time_of_day = orders[0].time_of_day if orders[0].time_of_day else 'morning'
-        travel_to_pickup_time = self.prediction_service.predict_travel_time(
+        travel_to_pickup_time = self._tt(
             asset.current_location, 'clubhouse', time_of_day
         )
         
         # Get predicted prep time for all orders combined
         # For batched orders, use the max prep time needed
-        max_prep_time = max(self.prediction_service.predict_order_prep_time(order) for order in orders)
+        max_prep_time = max(self._prep_for(order) for order in orders)
         
         # Calculate delivery sequence and times
         destinations = []
         current_time = max_prep_time + travel_to_pickup_time
         last_location = 'clubhouse'  # Starting from clubhouse
+        delivery_penalty = 0  # No penalty for the first order in the batch
         
-        for i, order in enumerate(orders):
-            # Travel time from last location to this order's predicted location
-            travel_time = self.prediction_service.predict_travel_time(
-                last_location, order.hole_number, time_of_day
-            )
-            current_time += travel_time
-            
-            # Add delivery penalty for each additional order
-            if i > 0:
-                current_time += BATCH_DELIVERY_TIME_PENALTY
+        for order in orders:
+            # Travel time from last location to this order's predicted location,
+            # plus the delivery penalty for each additional order
+            current_time += self._tt(last_location, order.hole_number, time_of_day)
+            current_time += delivery_penalty
+            delivery_penalty = BATCH_DELIVERY_TIME_PENALTY
             
             # Predict where the player will be when we arrive
-            holes_advanced = math.floor(current_time / PLAYER_MIN_PER_HOLE)
-            predicted_hole = order.hole_number + holes_advanced
+            predicted_hole = order.hole_number + int(current_time // PLAYER_MIN_PER_HOLE)
             
             destinations.append((order, predicted_hole))
             last_location = predicted_hole
@@ -120,22 +331,16 @@ class Dispatcher:
         final_eta = float('inf')
         time_of_day = order.time_of_day if order.time_of_day else 'morning'
 
+        # Time for asset to get from current location to pickup (clubhouse)
+        travel_to_pickup_time = self._tt(asset.current_location, 'clubhouse', time_of_day)
+        
+        # Get predicted prep time based on order contents
+        prep_time = self._prep_for(order)
+
         # Iteratively calculate ETA to get a stable prediction. 3 iterations is enough.
         for _ in range(3):
-            asset_loc = self._get_location_as_hole_num(asset.current_location)
-            
-            # Time for asset to get from current location to pickup (clubhouse)
-            travel_to_pickup_time = self.prediction_service.predict_travel_time(
-                asset.current_location, 'clubhouse', time_of_day
-            )
-            
             # Time for asset to get from pickup to the predicted player location
-            travel_from_pickup_time = self.prediction_service.predict_travel_time(
-                'clubhouse', predicted_hole, time_of_day
-            )
-            
-            # Get predicted prep time based on order contents
-            prep_time = self.prediction_service.predict_order_prep_time(order)
+            travel_from_pickup_time = self._tt('clubhouse', predicted_hole, time_of_day)
             
             # Total time includes prep time and all travel
             total_eta = prep_time + travel_to_pickup_time + travel_from_pickup_time
@@ -153,15 +358,101 @@ class Dispatcher:
 
         return final_eta, predicted_hole, prep_time
 
+    def _score_asset(self, asset, order: Order, batch_orders: list, batch_mask: int):
+        """
+        Evaluates one eligible asset for the order and, if applicable, the batch.
+        batch_mask has a bit set for each hole in the batch.
+        Returns (candidate, batch_candidate); batch_candidate is None when not batchable.
+        """
+        # Evaluate individual order delivery
+        eta, predicted_hole, prep_time = self.calculate_eta_and_destination(asset, order)
+
+        # Check acceptance probability
+        acceptance_chance = self._acceptance_for(asset, order)
+        candidate = {
+            "asset": asset, 
+            "eta": eta, 
+            "predicted_hole": predicted_hole,
+            "prep_time": prep_time,
+            "acceptance_chance": acceptance_chance,
+            "orders": [order],
+            "is_batch": False
+        }
+        
+        # Evaluate batched delivery if applicable
+        if len(batch_orders) > 1:
+            # Check if all orders in batch can be delivered by this asset
+            can_deliver_batch = (self._zone_mask(asset) & batch_mask) == batch_mask
+            
+            if can_deliver_batch:
+                batch_eta, batch_destinations = self.calculate_batch_eta_and_destinations(asset, batch_orders)
+                # For batch acceptance, use the average acceptance chance
+                batch_acceptance = sum(self._acceptance_for(asset, o) for o in batch_orders) / len(batch_orders)
+                return candidate, {
+                    "asset": asset,
+                    "eta": batch_eta,
+                    "destinations": batch_destinations,
+                    "orders": batch_orders,
+                    "is_batch": True,
+                    "acceptance_chance": batch_acceptance,
+                    # Individual ETAs already computed for this asset, by order_id
+                    "individual_etas": {order.order_id: eta}
+                }
+        
+        return candidate, None
+
+    def _score_assets(self, assets: list, order: Order, batch_orders: list,
+                      candidates: list, batch_candidates: list):
+        """Scores each asset and appends the results to candidates and batch_candidates."""
+        batch_mask = 0
+        for batch_order in batch_orders:
+            batch_mask |= 1 << batch_order.hole_number
+        
+        # Assets are scored independently, so prediction calls can overlap when enabled.
+        # Errors propagate from either path alike (executor.map re-raises them in order).
+        if os.environ.get("SWOOP_PARALLEL_SCORING") == "1" and len(assets) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(assets))) as executor:
+                results = list(executor.map(
+                    lambda asset: self._score_asset(asset, order, batch_orders, batch_mask), assets
+                ))
+        else:
+            results = [self._score_asset(asset, order, batch_orders, batch_mask) for asset in assets]
+
+        for candidate, batch_candidate in results:
+            candidates.append(candidate)
+            if batch_candidate:
+                batch_candidates.append(batch_candidate)
+
+    @staticmethod
+    def _fastest_candidates(candidates, min_acceptance: float = -math.inf):
+        """
+        Finds the fastest candidate and the fastest beverage cart candidate in one pass,
+        skipping any with an acceptance chance of min_acceptance or less.
+        Earlier candidates win ties. Returns (fastest, fastest cart); either may be None.
+        """
+        fastest_candidate = best_cart_candidate = None
+        for candidate in candidates:
+            if candidate['acceptance_chance'] <= min_acceptance:
+                continue
+            eta = candidate["eta"]
+            if fastest_candidate is None or eta < fastest_candidate["eta"]:
+                fastest_candidate = candidate
+            if candidate['asset'].KIND == CART_KIND and (
+                    best_cart_candidate is None or eta < best_cart_candidate["eta"]):
+                best_cart_candidate = candidate
+        return fastest_candidate, best_cart_candidate
+
     def find_best_candidate(self, order: Order, consider_batching: bool = True):
         """
         Finds the best-ranked candidate for a given order, with a preference
         for beverage carts if they are not significantly slower.
         Also evaluates batching opportunities when enabled.
         """
+        self.begin_round()
+
         # If a pluggable strategy is configured, delegate to it for simple dispatch
         if self.strategy and not consider_batching:
-            available_assets = [a for a in self.assets if a.status == AssetStatus.IDLE]
+            available_assets = [a for a in self.assets if a.status is _IDLE]
             chosen_asset = self.strategy.choose_asset(order, available_assets)
             if chosen_asset:
                 score_info = self.strategy.score_asset_order_pair(chosen_asset, order)
@@ -182,90 +473,55 @@ class Dispatcher:
         # Identify potential batch orders
         batch_orders = self.identify_batchable_orders(order) if consider_batching else [order]
 
-        # 1. Get eligible candidates for both individual and batched deliveries
-        for asset in self.assets:
-            if asset.status == AssetStatus.IDLE:
-                # Evaluate individual order delivery
-                eta, predicted_hole, prep_time = self.calculate_eta_and_destination(asset, order)
-                
-                # Check beverage carts for zone restriction
-                can_deliver = True
-                if isinstance(asset, BeverageCart):
-                    order_is_on_front = order.hole_number in self.course_data["front_9_holes"]
-                    if not ((order_is_on_front and asset.loop == "front_9") or 
-                            (not order_is_on_front and asset.loop == "back_9")):
-                        can_deliver = False
-                
-                if can_deliver:
-                    # Check acceptance probability
-                    acceptance_chance = self.prediction_service.predict_offer_acceptance_chance(asset, order)
-                    candidates.append({
-                        "asset": asset, 
-                        "eta": eta, 
-                        "predicted_hole": predicted_hole,
-                        "prep_time": prep_time,
-                        "acceptance_chance": acceptance_chance,
-                        "orders": [order],
-                        "is_batch": False
-                    })
-                    
-                    # Evaluate batched delivery if applicable
-                    if len(batch_orders) > 1:
-                        # Check if all orders in batch can be delivered by this asset
-                        can_deliver_batch = True
-                        if isinstance(asset, BeverageCart):
-                            for batch_order in batch_orders:
-                                order_is_on_front = batch_order.hole_number in self.course_data["front_9_holes"]
-                                if not ((order_is_on_front and asset.loop == "front_9") or 
-                                       (not order_is_on_front and asset.loop == "back_9")):
-                                    can_deliver_batch = False
-                                    break
-                        
-                        if can_deliver_batch:
-                            batch_eta, batch_destinations = self.calculate_batch_eta_and_destinations(asset, batch_orders)
-                            # For batch acceptance, use the average acceptance chance
-                            batch_acceptance = sum(self.prediction_service.predict_offer_acceptance_chance(asset, o) 
-                                                 for o in batch_orders) / len(batch_orders)
-                            batch_candidates.append({
-                                "asset": asset,
-                                "eta": batch_eta,
-                                "destinations": batch_destinations,
-                                "orders": batch_orders,
-                                "is_batch": True,
-                                "acceptance_chance": batch_acceptance
-                            })
-        
-        # 2. Combine and rank all candidates
-        all_candidates = candidates + batch_candidates
+        # 1. Get eligible candidates for both individual and batched deliveries.
+        # Idle status and the cart zone restriction are checked for the whole fleet at once,
+        # so only assets that can actually take the order are scored.
+        idle, zones = self._asset_arrays()
+        eligible = idle & ((zones >> order.hole_number) & 1).astype(bool)
+
+        eligible_assets = [self.assets[index] for index in np.flatnonzero(eligible)]
+        carts = [asset for asset in eligible_assets if asset.KIND == CART_KIND]
+        staff = [asset for asset in eligible_assets if asset.KIND != CART_KIND]
+        self._prefetch_predictions(eligible_assets, batch_orders, order.time_of_day or 'morning')
+
+        # Score carts first. Staff can only be chosen by beating the best viable cart by more
+        # than BEV_CART_PREFERENCE_MIN, and no delivery is faster than the order's prep time
+        # (less the batch bonus), so skip scoring staff when that is already impossible.
+        self._score_assets(carts, order, batch_orders, candidates, batch_candidates)
+        best_cart_eta = min((c["eta"] for c in itertools.chain(candidates, batch_candidates)
+                             if c["acceptance_chance"] > 0.5),
+                            default=math.inf)
+        if staff and best_cart_eta < math.inf:
+            eta_floor = min(c["prep_time"] for c in candidates)
+            if len(batch_orders) > 1:
+                eta_floor *= BATCH_EFFICIENCY_BONUS
+            if eta_floor >= best_cart_eta - BEV_CART_PREFERENCE_MIN:
+                staff = []
+        self._score_assets(staff, order, batch_orders, candidates, batch_candidates)
         
-        # Filter candidates by acceptance probability
+        # 2. Rank individual and batch candidates together
         # Only consider candidates with >50% acceptance chance
-        viable_candidates = [c for c in all_candidates if c['acceptance_chance'] > 0.5]
+        fastest_candidate, best_cart_candidate = self._fastest_candidates(
+            itertools.chain(candidates, batch_candidates), min_acceptance=0.5
+        )
         
-        if not viable_candidates:
+        if fastest_candidate is None:
             # If no one is likely to accept, consider all candidates
-            print("(WARNING: No candidates with >50% acceptance chance. Considering all candidates.)")
-            viable_candidates = all_candidates
+            logger.warning("No candidates with >50% acceptance chance. Considering all candidates.")
+            fastest_candidate, best_cart_candidate = self._fastest_candidates(
+                itertools.chain(candidates, batch_candidates)
+            )
         
-        if not viable_candidates:
+        if fastest_candidate is None:
             return None
         
-        # Sort to find the absolute fastest candidate
-        viable_candidates.sort(key=lambda x: x["eta"])
-        fastest_candidate = viable_candidates[0]
-
-        # Find the best available beverage cart candidate
-        cart_candidates = [c for c in viable_candidates if isinstance(c['asset'], BeverageCart)]
-        
-        if not cart_candidates:
+        if best_cart_candidate is None:
             # No available carts, so return the fastest overall candidate
             return fastest_candidate
 
-        best_cart_candidate = min(cart_candidates, key=lambda x: x['eta'])
-
         # Prefer the cart if it's not more than 10 minutes slower
         if best_cart_candidate['eta'] <= fastest_candidate['eta'] + BEV_CART_PREFERENCE_MIN:
-            print(f"(INFO: Beverage cart preferred. ETA diff: {best_cart_candidate['eta'] - fastest_candidate['eta']:.2f} min)")
+            logger.info("Beverage cart preferred. ETA diff: %.2f min", best_cart_candidate['eta'] - fastest_candidate['eta'])
             return best_cart_candidate
         else:
             return fastest_candidate
@@ -282,64 +538,154 @@ class Dispatcher:
             
             # Simulate whether the asset actually accepts the order
             if random.random() <= acceptance_chance:
-                # Set destination based on first order
-                best_asset.destination = orders_to_assign[0].hole_number
-                
-                # Use the simulator to update asset state properly
-                self.simulator.update_asset_state_for_new_order(best_asset, orders_to_assign[0])
-                
-                # Assign all orders in the batch
-                for order_to_assign in orders_to_assign:
-                    order_to_assign.assigned_to = best_asset
-                    order_to_assign.status = OrderStatus.ASSIGNED
-                    if order_to_assign not in best_asset.current_orders:
-                        best_asset.current_orders.append(order_to_assign)
-                    # Remove from pending orders if it was there
-                    if order_to_assign in self.pending_orders:
-                        self.pending_orders.remove(order_to_assign)
+                if is_batch and logger.isEnabledFor(logging.INFO):
+                    # Complete the individual ETAs for the efficiency figure before assignment
+                    # clears the cached prep times; travel times are still cached for this round
+                    individual_etas = best_candidate_info.setdefault("individual_etas", {})
+                    for batch_order in orders_to_assign:
+                        if batch_order.order_id not in individual_etas:
+                            individual_etas[batch_order.order_id], _, _ = \
+                                self.calculate_eta_and_destination(best_asset, batch_order)
+                self._assign_orders(best_asset, orders_to_assign)
                 
-                # Log the assignment
-                if is_batch and len(orders_to_assign) > 1:
-                    order_ids = ", ".join([o.order_id for o in orders_to_assign])
-                    holes = ", ".join([str(o.hole_number) for o in orders_to_assign])
-                    print(f"\n=== BATCH DELIVERY ===")
-                    print(f"Orders {order_ids} for holes {holes} assigned to {best_asset.name}.")
-                    print(f"Batch size: {len(orders_to_assign)} orders")
-                    print(f"Acceptance probability was {acceptance_chance:.1%}")
+                # Log the assignment (skipped entirely when INFO is disabled; the batch
+                # summary may run ETA predictions for the efficiency figure)
+                if logger.isEnabledFor(logging.INFO):
+                    if is_batch and len(orders_to_assign) > 1:
+                        order_ids = ", ".join([o.order_id for o in orders_to_assign])
+                        holes = ", ".join([str(o.hole_number) for o in orders_to_assign])
+                        logger.info("\n=== BATCH DELIVERY ===")
+                        logger.info("Orders %s for holes %s assigned to %s.", order_ids, holes, best_asset.name)
+                        logger.info("Batch size: %d orders", len(orders_to_assign))
+                        logger.info("Acceptance probability was %.1f%%", acceptance_chance * 100)
                     
-                    # Show delivery sequence
-                    destinations = best_candidate_info.get("destinations", [])
-                    for i, (batch_order, predicted_hole) in enumerate(destinations):
-                        print(f"  → Delivery {i+1}: Order {batch_order.order_id} to Hole {predicted_hole}")
+                        # Show delivery sequence
+                        destinations = best_candidate_info.get("destinations", [])
+                        for i, (batch_order, predicted_hole) in enumerate(destinations):
+                            logger.info("  → Delivery %d: Order %s to Hole %s", i + 1, batch_order.order_id, predicted_hole)
                     
-                    print(f"Total batch ETA: {best_candidate_info['eta']:.2f} minutes")
+                        logger.info("Total batch ETA: %.2f minutes", best_candidate_info['eta'])
                     
-                    # Calculate efficiency gain
-                    individual_eta_sum = 0
-                    for batch_order in orders_to_assign:
-                        ind_eta, _, _ = self.calculate_eta_and_destination(best_asset, batch_order)
-                        individual_eta_sum += ind_eta
-                    efficiency_gain = (individual_eta_sum - best_candidate_info['eta']) / individual_eta_sum * 100
-                    print(f"Efficiency gain: {efficiency_gain:.1f}% time saved vs individual deliveries")
-                else:
-                    # Single order delivery
-                    print(f"\nOrder {order.order_id} for hole {order.hole_number} assigned to {best_asset.name}.")
-                    if "predicted_hole" in best_candidate_info:
-                        prep_time = best_candidate_info.get('prep_time', PREP_TIME_MIN)
-                        print(f"→ Predicted delivery at Hole {best_candidate_info['predicted_hole']} in {best_candidate_info['eta']:.2f} minutes (prep: {prep_time:.1f} min)")
-                    print(f"→ Acceptance probability was {acceptance_chance:.1%}")
+                        # Calculate efficiency gain from the individual ETAs gathered above
+                        individual_etas = best_candidate_info["individual_etas"]
+                        individual_eta_sum = sum(individual_etas[o.order_id] for o in orders_to_assign)
+                        efficiency_gain = (individual_eta_sum - best_candidate_info['eta']) / individual_eta_sum * 100
+                        logger.info("Efficiency gain: %.1f%% time saved vs individual deliveries", efficiency_gain)
+                    else:
+                        # Single order delivery
+                        logger.info("\nOrder %s for hole %s assigned to %s.", order.order_id, order.hole_number, best_asset.name)
+                        if "predicted_hole" in best_candidate_info:
+                            prep_time = best_candidate_info.get('prep_time', PREP_TIME_MIN)
+                            logger.info("→ Predicted delivery at Hole %s in %.2f minutes (prep: %.1f min)",
+                                        best_candidate_info['predicted_hole'], best_candidate_info['eta'], prep_time)
+                        logger.info("→ Acceptance probability was %.1f%%", acceptance_chance * 100)
                 
                 return best_asset
             else:
-                print(f"{best_asset.name} declined the order (acceptance chance was {acceptance_chance:.1%}).")
+                logger.info("%s declined the order (acceptance chance was %.1f%%).", best_asset.name, acceptance_chance * 100)
                 # In a real system, we would retry with the next best candidate
                 return None
         else:
-            print(f"No available candidates found for order {order.order_id}.")
+            logger.info("No available candidates found for order %s.", order.order_id)
             return None
     
+    def _assign_orders(self, asset, orders_to_assign: list):
+        """Commits the orders to the asset and removes them from the pending list."""
+        # Set destination based on first order
+        asset.destination = orders_to_assign[0].hole_number
+        
+        # Use the simulator to update asset state properly
+        self.simulator.update_asset_state_for_new_order(asset, orders_to_assign[0])
+        
+        # Assign all orders in the batch; membership is checked by order_id against one
+        # snapshot rather than comparing whole dataclasses across the list per order
+        held_order_ids = {o.order_id for o in asset.current_orders}
+        for order_to_assign in orders_to_assign:
+            order_to_assign.assigned_to = asset
+            order_to_assign.status = OrderStatus.ASSIGNED
+            if order_to_assign.order_id not in held_order_ids:
+                asset.current_orders.append(order_to_assign)
+                held_order_ids.add(order_to_assign.order_id)
+            # Drop its prep estimate and remove it from pending orders if it was there
+            self._prep_cache.pop(order_to_assign.order_id, None)
+            self.remove_pending_order(order_to_assign)
+
+    def dispatch_pending_batch(self, solver: str = "hungarian"):
+        """
+        Assigns all pending orders at once by solving the order/asset assignment problem.
+        Cost is the ETA, with non-cart assets biased by BEV_CART_PREFERENCE_MIN so carts
+        are preferred unless significantly slower. Each asset takes at most one order;
+        unassigned or declined orders stay pending.
+
+        solver is "hungarian" (scipy's linear_sum_assignment) or "auction", which scales
+        better for very large fleets. Without scipy, "hungarian" falls back to a greedy
+        assignment and logs a warning. The solver actually used is recorded in
+        last_batch_solver ("hungarian", "greedy" or "auction").
+
+        Returns a list of (order, asset) pairs that were assigned.
+        """
+        if solver not in ("hungarian", "auction"):
+            raise ValueError(f"Unknown assignment solver: {solver}")
+        self.begin_round()
+
+        orders = list(self._pending.values())
+        if not orders or not self.assets:
+            return []
+
+        idle, zones = self._asset_arrays()
+        is_cart = zones != ALL_HOLES_MASK
+        etas = np.full((len(orders), len(self.assets)), np.inf)
+
+        for row, order in enumerate(orders):
+            eligible = idle & ((zones >> order.hole_number) & 1).astype(bool)
+            for col in np.flatnonzero(eligible):
+                etas[row, col], _, _ = self.calculate_eta_and_destination(self.assets[col], order)
+
+        # Orders no asset can take and assets that can take no order are left out of the solve
+        feasible = np.isfinite(etas)
+        order_rows = np.flatnonzero(feasible.any(axis=1))
+        asset_cols = np.flatnonzero(feasible.any(axis=0))
+        if not order_rows.size:
+            return []
+        etas = etas[np.ix_(order_rows, asset_cols)]
+        cost = etas + np.where(is_cart[asset_cols], 0, BEV_CART_PREFERENCE_MIN)
+
+        if solver == "auction":
+            row_ind, col_ind = _auction_assignment(cost)
+        elif linear_sum_assignment is not None:
+            row_ind, col_ind = linear_sum_assignment(np.where(np.isfinite(cost), cost, INELIGIBLE_COST))
+        else:
+            logger.warning("scipy is not installed; solving the pending batch with the greedy assignment "
+                           "instead of the Hungarian algorithm.")
+            solver = "greedy"
+            row_ind, col_ind = _greedy_assignment(np.where(np.isfinite(cost), cost, INELIGIBLE_COST))
+        self.last_batch_solver = solver
+
+        assigned = []
+        for row, col in zip(row_ind, col_ind):
+            if not np.isfinite(etas[row, col]):
+                continue
+            order, asset = orders[order_rows[row]], self.assets[asset_cols[col]]
+            acceptance_chance = self.prediction_service.predict_offer_acceptance_chance(asset, order)
+            if random.random() <= acceptance_chance:
+                self._assign_orders(asset, [order])
+                logger.info("Order %s for hole %s assigned to %s (ETA %.2f min).",
+                            order.order_id, order.hole_number, asset.name, etas[row, col])
+                assigned.append((order, asset))
+            else:
+                logger.info("%s declined order %s (acceptance chance was %.1f%%).", asset.name, order.order_id, acceptance_chance * 100)
+        return assigned
+
     def add_pending_order(self, order: Order):
         """Adds an order to the pending orders list for potential batching."""
-        if order not in self.pending_orders:
-            self.pending_orders.append(order)
-            print(f"Order {order.order_id} added to pending orders for potential batching.") 
\ No newline at end of file
+        if order.order_id not in self._pending:
+            self._pending[order.order_id] = order
+            self._by_hole[order.hole_number][order.order_id] = (next(self._pending_seq), order)
+            logger.info("Order %s added to pending orders for potential batching.", order.order_id)
+
+    def remove_pending_order(self, order: Order) -> bool:
+        """Removes an order from the pending orders. Returns False if it was not pending."""
+        if self._pending.pop(order.order_id, None) is None:
+            return False
+        self._by_hole[order.hole_number].pop(order.order_id, None)
+        return True 
\ No newline at end of file
@@ -1,18 +1,78 @@
 """
 Pluggable dispatcher strategies for the delivery system.
 """
+import logging
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Optional, Dict, Tuple
 import math
 
-from .models import BeverageCart, DeliveryStaff, Order, AssetStatus, DeliveryAsset
+import numpy as np
+
+from .models import Order, AssetStatus, DeliveryAsset, CART_KIND
 from .course_data import COURSE_DATA
 
-# Constants for dispatch calculations
-PREP_TIME_MIN = 10
-PLAYER_MIN_PER_HOLE = 15  
+logger = logging.getLogger(__name__)
+
+# Constants for dispatch calculations, shared with the Dispatcher
+PREP_TIME_MIN = 10  # Default prep time
+PLAYER_MIN_PER_HOLE = 15  # Average time a player takes to complete a hole
 TRAVEL_TIME_PER_HOLE = 1.5 
-BEV_CART_PREFERENCE_MIN = 10 
+BEV_CART_PREFERENCE_MIN = 10  # Preference window for beverage carts
+
+# Status alias for identity checks (Enum members are singletons)
+_AVAILABLE = AssetStatus.AVAILABLE
+
+# Loop codes used by the array view of the assets
+LOOP_CODES = {"front_9": 0, "back_9": 1}
+NO_LOOP = -1  # Delivery staff can serve any hole
+UNKNOWN_LOOP = -2  # Beverage cart without a recognised loop; never eligible
+
+
+def solve_holes_advanced(base_eta: float, travel_per_hole: float) -> int:
+    """
+    Holes a player advances before delivery arrives, given the ETA to the order's hole
+    and the extra travel time per hole the player moves on.
+
+    The delivery hole is order_hole + k for the smallest k >= 0 satisfying
+      k = floor((base_eta + k * T) / P)
+    with T = travel_per_hole and P = PLAYER_MIN_PER_HOLE, which is the smallest k >= 0
+    with k * (P - T) > base_eta - P. That needs the player to be slower per hole than the
+    asset (P > T); otherwise the player is never caught and floor(base_eta / P) is used.
+    """
+    if base_eta < PLAYER_MIN_PER_HOLE:
+        return 0
+    if travel_per_hole < PLAYER_MIN_PER_HOLE:
+        return math.floor((base_eta - PLAYER_MIN_PER_HOLE) / (PLAYER_MIN_PER_HOLE - travel_per_hole)) + 1
+    return math.floor(base_eta / PLAYER_MIN_PER_HOLE)
+
+
+@lru_cache(maxsize=4096)
+def _eta_core(asset_loc: int, order_hole: int) -> Tuple[float, int]:
+    """
+    ETA and predicted delivery hole for an asset at asset_loc (clubhouse = 0).
+    Pure function of the module constants, so results are cached; call
+    _eta_core.cache_clear() if the constants are ever changed at runtime.
+    """
+    # Time for asset to get from current location to pickup (clubhouse)
+    travel_to_pickup_time = abs(asset_loc - 0) * TRAVEL_TIME_PER_HOLE
+    
+    # ETA to the order hole, then solve for the hole the player will have reached
+    base_eta = PREP_TIME_MIN + travel_to_pickup_time + abs(order_hole - 0) * TRAVEL_TIME_PER_HOLE
+    holes_advanced = solve_holes_advanced(base_eta, TRAVEL_TIME_PER_HOLE)
+    predicted_hole = order_hole + holes_advanced
+    final_eta = base_eta + holes_advanced * TRAVEL_TIME_PER_HOLE
+    
+    return final_eta, predicted_hole
+
+
+# _eta_core for every asset location on the course ('clubhouse' or a hole) and order hole,
+# keyed by the location as stored on the asset so lookups skip the location conversion
+_ETA_TABLE: Dict[Tuple[object, int], Tuple[float, int]] = {
+    (location, order_hole): _eta_core(0 if location == 'clubhouse' else location, order_hole)
+    for location in ('clubhouse', *range(COURSE_DATA["holes"] + 1))
+    for order_hole in range(1, COURSE_DATA["holes"] + 1)
+}
 
 
 class DispatchStrategy(ABC):
@@ -21,6 +81,7 @@ class DispatchStrategy(ABC):
     def __init__(self, assets: List[DeliveryAsset]):
         self.assets = assets
         self.course_data = COURSE_DATA
+        self._front9 = frozenset(self.course_data["front_9_holes"])
     
     @abstractmethod
     def choose_asset(self, order: Order, available_assets: List[DeliveryAsset]) -> Optional[DeliveryAsset]:
@@ -52,7 +113,45 @@ class DispatchStrategy(ABC):
     
     def get_available_assets(self) -> List[DeliveryAsset]:
         """Get all assets with AVAILABLE status."""
-        return [asset for asset in self.assets if asset.status == AssetStatus.AVAILABLE]
+        return [asset for asset in self.assets if asset.status is _AVAILABLE]
+    
+    def _asset_arrays(self, assets: List[DeliveryAsset]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build a column (structure-of-arrays) view of the assets for vectorized scoring.
+        
+        Returns:
+            Tuple of (locations, loop codes, current order counts), one entry per asset.
+            Locations are hole numbers with the clubhouse as 0.
+        """
+        n = len(assets)
+        locs = np.fromiter(
+            (int(self._get_location_as_hole_num(a.current_location)) for a in assets),
+            dtype=np.int8, count=n
+        )
+        loops = np.fromiter(
+            (LOOP_CODES.get(a.loop, UNKNOWN_LOOP) if a.KIND == CART_KIND else NO_LOOP
+             for a in assets),
+            dtype=np.int8, count=n
+        )
+        loads = np.fromiter((len(a.current_orders) for a in assets), dtype=np.int32, count=n)
+        return locs, loops, loads
+    
+    def _eligible_mask(self, loops: np.ndarray, order: Order) -> np.ndarray:
+        """Vectorized zone check: carts only serve their own nine, staff serve any hole."""
+        order_loop = LOOP_CODES["front_9"] if order.hole_number in self._front9 else LOOP_CODES["back_9"]
+        return (loops == NO_LOOP) | (loops == order_loop)
+    
+    def _is_asset_eligible(self, asset: DeliveryAsset, order: Order) -> bool:
+        """Check if an asset is eligible to handle an order."""
+        # Beverage carts have zone restrictions
+        if asset.KIND == CART_KIND:
+            order_is_on_front = order.hole_number in self._front9
+            if order_is_on_front and asset.loop != "front_9":
+                return False
+            if not order_is_on_front and asset.loop != "back_9":
+                return False
+        
+        return True
     
     def _get_location_as_hole_num(self, location):
         """Converts location ('clubhouse' or hole number) to an integer."""
@@ -74,47 +173,44 @@ class SimpleDispatcher(DispatchStrategy):
         if not available_assets:
             return None
             
-        candidates = []
+        # Track the fastest asset and the fastest beverage cart in a single pass
+        fastest_asset = best_cart_asset = None
+        fastest_eta = best_cart_eta = math.inf
+        
+        # Per-order values hoisted out of the loop; the zone check and ETA lookup are
+        # inlined versions of _is_asset_eligible and calculate_eta_and_destination
+        order_hole = order.hole_number
+        order_loop = "front_9" if order_hole in self._front9 else "back_9"
         
         # Evaluate each available asset
         for asset in available_assets:
-            # Check if asset is eligible
-            if not self._is_asset_eligible(asset, order):
+            is_cart = asset.KIND == CART_KIND
+            # Carts only serve their own loop
+            if is_cart and asset.loop != order_loop:
                 continue
-                
-            # Calculate metrics
-            eta, predicted_hole = self.calculate_eta_and_destination(asset, order.hole_number)
-            score_data = self.score_asset_order_pair(asset, order)
             
-            candidates.append({
-                "asset": asset,
-                "eta": eta,
-                "predicted_hole": predicted_hole,
-                "score": score_data["final_score"],
-                "score_data": score_data
-            })
+            eta_and_hole = _ETA_TABLE.get((asset.current_location, order_hole))
+            if eta_and_hole is None:
+                eta_and_hole = _eta_core(self._get_location_as_hole_num(asset.current_location), order_hole)
+            eta = eta_and_hole[0]
+            
+            if fastest_asset is None or eta < fastest_eta:
+                fastest_asset, fastest_eta = asset, eta
+            if is_cart and (best_cart_asset is None or eta < best_cart_eta):
+                best_cart_asset, best_cart_eta = asset, eta
         
-        if not candidates:
+        if fastest_asset is None:
             return None
         
-        # Sort by ETA to find fastest
-        candidates.sort(key=lambda x: x["eta"])
-        fastest_candidate = candidates[0]
-        
-        # Find best beverage cart
-        cart_candidates = [c for c in candidates if isinstance(c['asset'], BeverageCart)]
-        
-        if not cart_candidates:
-            return fastest_candidate["asset"]
-        
-        best_cart_candidate = min(cart_candidates, key=lambda x: x['eta'])
+        if best_cart_asset is None:
+            return fastest_asset
         
         # Prefer cart if within preference window
-        if best_cart_candidate['eta'] <= fastest_candidate['eta'] + BEV_CART_PREFERENCE_MIN:
-            print(f"(INFO: Beverage cart preferred. ETA diff: {best_cart_candidate['eta'] - fastest_candidate['eta']:.2f} min)")
-            return best_cart_candidate["asset"]
+        if best_cart_eta <= fastest_eta + BEV_CART_PREFERENCE_MIN:
+            logger.info("Beverage cart preferred. ETA diff: %.2f min", best_cart_eta - fastest_eta)
+            return best_cart_asset
         else:
-            return fastest_candidate["asset"]
+            return fastest_asset
     
     def score_asset_order_pair(self, asset: DeliveryAsset, order: Order) -> Dict[str, float]:
         """
@@ -131,7 +227,7 @@ class SimpleDispatcher(DispatchStrategy):
         distance_score = abs(asset_loc - 0) * TRAVEL_TIME_PER_HOLE
         
         # Asset type score (preference for beverage carts)
-        asset_type_score = 0 if isinstance(asset, BeverageCart) else 5
+        asset_type_score = 0 if asset.KIND == CART_KIND else 5
         
         # Predictability score (how far ahead we're predicting)
         predictability_score = abs(predicted_hole - order.hole_number) * 2
@@ -154,47 +250,11 @@ class SimpleDispatcher(DispatchStrategy):
             "final_score": final_score
         }
     
-    def _is_asset_eligible(self, asset: DeliveryAsset, order: Order) -> bool:
-        """Check if an asset is eligible to handle an order."""
-        # Beverage carts have zone restrictions
-        if isinstance(asset, BeverageCart):
-            order_is_on_front = order.hole_number in self.course_data["front_9_holes"]
-            if order_is_on_front and asset.loop != "front_9":
-                return False
-            if not order_is_on_front and asset.loop != "back_9":
-                return False
-        
-        return True
-    
     def calculate_eta_and_destination(self, asset: DeliveryAsset, order_hole: int) -> Tuple[float, int]:
         """
         Calculate the final ETA and predicted delivery hole for an asset.
         """
-        predicted_hole = order_hole
-        final_eta = float('inf')
-        
-        # Iteratively calculate ETA to get a stable prediction
-        for _ in range(3):
-            asset_loc = self._get_location_as_hole_num(asset.current_location)
-            
-            # Time for asset to get from current location to pickup (clubhouse)
-            travel_to_pickup_time = abs(asset_loc - 0) * TRAVEL_TIME_PER_HOLE
-            
-            # Time for asset to get from pickup to the predicted player location
-            travel_from_pickup_time = abs(predicted_hole - 0) * TRAVEL_TIME_PER_HOLE
-            
-            # Total time includes prep time and all travel
-            total_eta = PREP_TIME_MIN + travel_to_pickup_time + travel_from_pickup_time
-            
-            # Predict how many holes the player has advanced in that time
-            holes_advanced = math.floor(total_eta / PLAYER_MIN_PER_HOLE)
-            new_predicted_hole = order_hole + holes_advanced
-            
-            if new_predicted_hole == predicted_hole:
-                final_eta = total_eta
-                break
-            
-            predicted_hole = new_predicted_hole
-            final_eta = total_eta
-        
-        return final_eta, predicted_hole
\ No newline at end of file
+        eta = _ETA_TABLE.get((asset.current_location, order_hole))
+        if eta is None:
+            eta = _eta_core(self._get_location_as_hole_num(asset.current_location), order_hole)
+        return eta
@@ -4,8 +4,28 @@ Example custom dispatcher strategies to demonstrate the pluggable architecture.
 from typing import List, Optional, Dict
 import random
 
+import numpy as np
+
 from .dispatcher_strategies import DispatchStrategy
-from .models import DeliveryAsset, Order, BeverageCart, DeliveryStaff
+from .models import DeliveryAsset, Order, DeliveryStaff
+
+
+def least_loaded_index(locs: np.ndarray, eligible: np.ndarray, loads: np.ndarray) -> int:
+    """
+    Scoring kernel for load balancing over the column view of the assets.
+    
+    Picks the eligible asset with the fewest current orders, breaking ties by
+    distance to the clubhouse and then by position.
+    
+    Returns:
+        Index of the chosen asset, or -1 if no asset is eligible
+    """
+    if not eligible.any():
+        return -1
+    # A course is at most 18 holes long, so load * 32 + distance orders by load first
+    keys = loads.astype(np.int64) * 32 + np.abs(locs)
+    keys[~eligible] = np.iinfo(np.int64).max
+    return int(np.argmin(keys))
 
 
 class NearestAssetDispatcher(DispatchStrategy):
@@ -19,22 +39,16 @@ class NearestAssetDispatcher(DispatchStrategy):
         if not available_assets:
             return None
         
-        best_asset = None
-        min_distance = float('inf')
+        locs, loops, _ = self._asset_arrays(available_assets)
         
-        for asset in available_assets:
-            if not self._is_asset_eligible(asset, order):
-                continue
-            
-            # Calculate distance from asset to clubhouse
-            asset_loc = self._get_location_as_hole_num(asset.current_location)
-            distance = abs(int(asset_loc) - 0)  # Distance to clubhouse
-            
-            if distance < min_distance:
-                min_distance = distance
-                best_asset = asset
+        # Distance from each asset to the clubhouse; ineligible assets can never win
+        distances = np.abs(locs).astype(np.float64)
+        distances[~self._eligible_mask(loops, order)] = np.inf
         
-        return best_asset
+        best = int(np.argmin(distances))  # First minimum, matching the old strict '<' scan
+        if distances[best] == np.inf:
+            return None
+        return available_assets[best]
     
     def score_asset_order_pair(self, asset: DeliveryAsset, order: Order) -> Dict[str, float]:
         """Score based purely on distance."""
@@ -47,16 +61,7 @@ class NearestAssetDispatcher(DispatchStrategy):
             "eta": distance * 1.5 + 10,  # Simplified ETA calculation
             "predicted_hole": order.hole_number
         }
-    
-    def _is_asset_eligible(self, asset: DeliveryAsset, order: Order) -> bool:
-        """Check zone restrictions for beverage carts."""
-        if isinstance(asset, BeverageCart):
-            order_is_on_front = order.hole_number in self.course_data["front_9_holes"]
-            if order_is_on_front and asset.loop != "front_9":
-                return False
-            if not order_is_on_front and asset.loop != "back_9":
-                return False
-        return True
+
 
 
 class RandomDispatcher(DispatchStrategy):
@@ -90,16 +95,7 @@ class RandomDispatcher(DispatchStrategy):
             "eta": 25.0,  # Default ETA
             "predicted_hole": order.hole_number + 1
         }
-    
-    def _is_asset_eligible(self, asset: DeliveryAsset, order: Order) -> bool:
-        """Check zone restrictions for beverage carts."""
-        if isinstance(asset, BeverageCart):
-            order_is_on_front = order.hole_number in self.course_data["front_9_holes"]
-            if order_is_on_front and asset.loop != "front_9":
-                return False
-            if not order_is_on_front and asset.loop != "back_9":
-                return False
-        return True
+
 
 
 class LoadBalancedDispatcher(DispatchStrategy):
@@ -110,26 +106,14 @@ class LoadBalancedDispatcher(DispatchStrategy):
     
     def choose_asset(self, order: Order, available_assets: List[DeliveryAsset]) -> Optional[DeliveryAsset]:
         """Choose asset with the least number of current orders."""
-        eligible_assets = [
-            asset for asset in available_assets 
-            if self._is_asset_eligible(asset, order)
-        ]
-        
-        if not eligible_assets:
+        if not available_assets:
             return None
         
-        # Sort by number of current orders (ascending)
-        eligible_assets.sort(key=lambda a: len(a.current_orders))
-        
         # Among assets with the same load, prefer the nearest
-        min_orders = len(eligible_assets[0].current_orders)
-        least_loaded = [a for a in eligible_assets if len(a.current_orders) == min_orders]
+        locs, loops, loads = self._asset_arrays(available_assets)
+        best = least_loaded_index(locs, self._eligible_mask(loops, order), loads)
         
-        # Choose nearest among least loaded
-        best_asset = min(least_loaded, 
-                        key=lambda a: abs(int(self._get_location_as_hole_num(a.current_location)) - 0))
-        
-        return best_asset
+        return available_assets[best] if best >= 0 else None
     
     def score_asset_order_pair(self, asset: DeliveryAsset, order: Order) -> Dict[str, float]:
         """Score based on current load and distance."""
@@ -147,13 +131,3 @@ class LoadBalancedDispatcher(DispatchStrategy):
             "eta": distance * 1.5 + 10 + load_score,
             "predicted_hole": order.hole_number + 1
         }
-    
-    def _is_asset_eligible(self, asset: DeliveryAsset, order: Order) -> bool:
-        """Check zone restrictions for beverage carts."""
-        if isinstance(asset, BeverageCart):
-            order_is_on_front = order.hole_number in self.course_data["front_9_holes"]
-            if order_is_on_front and asset.loop != "front_9":
-                return False
-            if not order_is_on_front and asset.loop != "back_9":
-                return False
-        return True
\ No newline at end of file
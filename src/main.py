@@ -2,6 +2,7 @@
 Main simulation runner for the Swoop Delivery system.
 Demonstrates different dispatcher strategies and configuration options.
 """
+import logging
 import sys
 from .simulation_engine import SimulationEngine
 from .simulation_config import SimulationConfig, SimulationPresets, DispatcherStrategy
@@ -331,4 +332,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main() 
\ No newline at end of file
@@ -3,7 +3,11 @@ Data models for the delivery system.
 """
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import List, Optional, Union
+from typing import ClassVar, List, Optional, Union
+
+# Asset type codes, set per class so hot loops can compare an int instead of calling isinstance
+CART_KIND = 0
+STAFF_KIND = 1
 
 class AssetStatus(Enum):
     """Represents the detailed status of a delivery asset."""
@@ -28,6 +32,8 @@ class OrderStatus(Enum):
 @dataclass
 class DeliveryAsset:
     """Base class for a delivery asset with common attributes."""
+    KIND: ClassVar[Optional[int]] = None
+    
     asset_id: str
     name: str
     status: AssetStatus = AssetStatus.IDLE
@@ -38,12 +44,13 @@ class DeliveryAsset:
 @dataclass
 class BeverageCart(DeliveryAsset):
     """Represents a beverage cart that is restricted to a specific loop."""
+    KIND: ClassVar[int] = CART_KIND
     loop: str = "front_9"  # "front_9" or "back_9"
 
 @dataclass
 class DeliveryStaff(DeliveryAsset):
     """Represents a delivery staff member who can roam the entire course."""
-    pass
+    KIND: ClassVar[int] = STAFF_KIND
 
 @dataclass
 class OrderItem:
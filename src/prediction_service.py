@@ -4,7 +4,9 @@ This service provides intelligent predictions for order prep time, travel time,
 """
 import math
 import random
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
+
+from .course_data import COURSE_DATA
 
 class PredictionService:
     """
@@ -29,6 +31,11 @@ class PredictionService:
             'afternoon': 1.0   # Normal speed
         }
         
+        # Deterministic part of the travel model, per time of day, keyed by (start, end) location
+        # for the clubhouse and every hole. Rebuild with _build_travel_table() if the travel
+        # parameters above are changed.
+        self._travel_table = self._build_travel_table()
+        
         # Acceptance model parameters
         self.base_acceptance_rate = 0.8
         self.distance_penalty_factor = 0.05  # Reduces acceptance by 5% per hole distance
@@ -71,6 +78,19 @@ class PredictionService:
         # Ensure minimum prep time
         return max(total_prep_time, 2.0)
     
+    def predict_order_prep_times(self, orders: List[Any]) -> List[float]:
+        """
+        Predicts preparation times for several orders in one call.
+        A trained model would score these as a single batch.
+        
+        Args:
+            orders: Order objects
+        
+        Returns:
+            Predicted preparation time in minutes for each order, in order
+        """
+        return [self.predict_order_prep_time(order) for order in orders]
+    
     def predict_travel_time(self, start_location: Any, end_location: Any, 
                           time_of_day: Optional[str] = None) -> float:
         """
@@ -84,30 +104,15 @@ class PredictionService:
         Returns:
             Predicted travel time in minutes
         """
-        # Convert locations to hole numbers
-        start_hole = self._location_to_hole_number(start_location)
-        end_hole = self._location_to_hole_number(end_location)
-        
-        # Calculate base distance
-        distance = abs(end_hole - start_hole)
-        
-        # Base travel time
-        base_time = distance * self.base_travel_time_per_hole
-        
-        # Apply traffic factor if time of day is specified
-        traffic_factor = 1.0
-        if time_of_day and time_of_day in self.traffic_patterns:
-            traffic_factor = self.traffic_patterns[time_of_day]
-        
-        # Account for terrain difficulty (holes 10-15 are uphill in our simulation)
-        terrain_factor = 1.0
-        if start_hole >= 10 and start_hole <= 15 and end_hole > start_hole:
-            terrain_factor = 1.2  # 20% slower going uphill
-        elif end_hole >= 10 and end_hole <= 15 and start_hole > end_hole:
-            terrain_factor = 0.9  # 10% faster going downhill
-        
-        # Calculate final travel time
-        travel_time = base_time * traffic_factor * terrain_factor
+        # Look up the deterministic travel time; fall back to computing it for
+        # locations or times of day outside the table
+        table = self._travel_table.get(time_of_day)
+        travel_time = table.get((start_location, end_location)) if table is not None else None
+        if travel_time is None:
+            # Convert locations to hole numbers
+            start_hole = self._location_to_hole_number(start_location)
+            end_hole = self._location_to_hole_number(end_location)
+            travel_time = self._base_travel_time(start_hole, end_hole, time_of_day)
         
         # Add small random variation (±10%)
         variation = random.uniform(0.9, 1.1)
@@ -116,6 +121,19 @@ class PredictionService:
         # Ensure minimum travel time (even for same location)
         return max(travel_time, 0.5)
     
+    def predict_travel_times(self, routes: List[Tuple[Any, Any, Optional[str]]]) -> List[float]:
+        """
+        Predicts travel times for several routes in one call.
+        A trained model would score these as a single batch.
+        
+        Args:
+            routes: (start_location, end_location, time_of_day) tuples
+        
+        Returns:
+            Predicted travel time in minutes for each route, in order
+        """
+        return [self.predict_travel_time(start, end, time_of_day) for start, end, time_of_day in routes]
+    
     def predict_offer_acceptance_chance(self, asset: Any, order: Any) -> float:
         """
         Predicts the probability that an asset will accept a delivery offer.
@@ -162,6 +180,46 @@ class PredictionService:
         # Ensure probability stays within bounds
         return max(0.1, min(1.0, acceptance_chance))
     
+    def _base_travel_time(self, start_hole: int, end_hole: int, time_of_day: Optional[str] = None) -> float:
+        """
+        Deterministic travel time between two holes (0 for clubhouse), before random variation.
+        """
+        # Calculate base distance
+        distance = abs(end_hole - start_hole)
+        
+        # Base travel time
+        base_time = distance * self.base_travel_time_per_hole
+        
+        # Apply traffic factor if time of day is specified
+        traffic_factor = 1.0
+        if time_of_day and time_of_day in self.traffic_patterns:
+            traffic_factor = self.traffic_patterns[time_of_day]
+        
+        # Account for terrain difficulty (holes 10-15 are uphill in our simulation)
+        terrain_factor = 1.0
+        if start_hole >= 10 and start_hole <= 15 and end_hole > start_hole:
+            terrain_factor = 1.2  # 20% slower going uphill
+        elif end_hole >= 10 and end_hole <= 15 and start_hole > end_hole:
+            terrain_factor = 0.9  # 10% faster going downhill
+        
+        # Calculate final travel time
+        return base_time * traffic_factor * terrain_factor
+    
+    def _build_travel_table(self) -> Dict[Optional[str], Dict[Tuple[Any, Any], float]]:
+        """
+        Precomputes _base_travel_time for every pair of course locations, once per time of day.
+        Locations are keyed as callers pass them: 'clubhouse' or a hole number.
+        """
+        locations = ['clubhouse', *range(COURSE_DATA["holes"] + 1)]
+        return {
+            time_of_day: {
+                (start, end): self._base_travel_time(self._location_to_hole_number(start),
+                                                     self._location_to_hole_number(end), time_of_day)
+                for start in locations for end in locations
+            }
+            for time_of_day in (None, *self.traffic_patterns)
+        }
+    
     def _location_to_hole_number(self, location: Any) -> int:
         """
         Converts a location to a hole number for distance calculations.
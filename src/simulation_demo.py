@@ -4,6 +4,7 @@ Demo of the refined asset movement simulation with state-driven behavior.
 from .models import BeverageCart, DeliveryStaff, Order, AssetStatus
 from .dispatcher import Dispatcher
 from .simulation import AssetSimulator
+import logging
 import time
 
 
@@ -153,6 +154,8 @@ def compare_movement_patterns():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Run the main simulation
     run_movement_simulation()
     
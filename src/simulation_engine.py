@@ -2,8 +2,10 @@
 Enhanced simulation engine for the Swoop Delivery system.
 Integrates configuration, metrics tracking, and event-driven simulation.
 """
+import math
 import random
 import heapq
+import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from uuid import uuid4
@@ -15,6 +17,21 @@ from .simulation_summary import SimulationSummary
 from .course_data import COURSE_DATA
 
 
+MIN_ORDER_INTERVAL_MIN = 0.5  # Minimum 30 seconds between orders
+
+
+def order_arrival_offsets(mean_interval: float, interval_stdev: float, duration_minutes: float) -> np.ndarray:
+    """
+    Draws every order arrival time for a run at once.
+    Returns minutes from the simulation start, all strictly before the end.
+    """
+    # Intervals are never shorter than the minimum, so this many draws always covers the run
+    n = int(math.ceil(duration_minutes / MIN_ORDER_INTERVAL_MIN)) + 1
+    intervals = np.maximum(MIN_ORDER_INTERVAL_MIN, np.random.normal(mean_interval, interval_stdev, n))
+    offsets = np.cumsum(intervals)
+    return offsets[offsets < duration_minutes]
+
+
 class SimulationEvent:
     """Represents an event in the simulation."""
     def __init__(self, timestamp: datetime, event_type: str, data: Dict):
@@ -31,6 +48,7 @@ class SimulationEngine:
     
     def __init__(self, config: SimulationConfig):
         self.config = config
+        self._front9 = frozenset(config.front_9_holes)
         self.summary = SimulationSummary(config=config)
         self.assets = []
         self.dispatcher = None
@@ -39,6 +57,21 @@ class SimulationEngine:
         self.end_time = datetime.now()  # Will be set properly in run()
         self.order_counter = 0
         self.pending_orders = []  # For batch processing
+    
+    def reset(self, config: Optional[SimulationConfig] = None):
+        """
+        Prepare the engine for another run, optionally with a new configuration.
+        Containers are cleared in place so parameter sweeps can reuse one engine.
+        """
+        if config is not None:
+            self.config = config
+        self._front9 = frozenset(self.config.front_9_holes)
+        self.summary = SimulationSummary(config=self.config)
+        self.assets.clear()
+        self.dispatcher = None
+        self.event_queue.clear()
+        self.pending_orders.clear()
+        self.order_counter = 0
         
     def initialize_assets(self):
         """Initialize delivery assets based on configuration."""
@@ -92,24 +125,22 @@ class SimulationEngine:
     
     def schedule_order_generation(self):
         """Schedule order generation events throughout the simulation."""
-        current = self.current_time
-        while current < self.end_time:
-            # Add variance to order timing
-            interval = random.gauss(
-                self.config.order_generation_interval_min / self.config.order_volume_multiplier,
-                self.config.order_generation_variance
-            )
-            interval = max(0.5, interval)  # Minimum 30 seconds between orders
-            
-            current += timedelta(minutes=interval)
-            if current < self.end_time:
-                hole = random.choice(self.config.front_9_holes + self.config.back_9_holes)
-                event = SimulationEvent(
-                    timestamp=current,
-                    event_type="generate_order",
-                    data={"hole_number": hole}
-                )
-                heapq.heappush(self.event_queue, event)
+        duration_minutes = (self.end_time - self.current_time).total_seconds() / 60
+        offsets = order_arrival_offsets(
+            self.config.order_generation_interval_min / self.config.order_volume_multiplier,
+            self.config.order_generation_variance,
+            duration_minutes
+        )
+        
+        holes = self.config.front_9_holes + self.config.back_9_holes
+        for offset in offsets.tolist():
+            self.event_queue.append(SimulationEvent(
+                timestamp=self.current_time + timedelta(minutes=offset),
+                event_type="generate_order",
+                data={"hole_number": random.choice(holes)}
+            ))
+        # Restore the heap invariant once instead of pushing each event
+        heapq.heapify(self.event_queue)
     
     def schedule_asset_updates(self):
         """Schedule periodic asset status updates."""
@@ -260,6 +291,10 @@ class SimulationEngine:
     
     def _dispatch_single_order(self, order: Order):
         """Dispatch a single order."""
+        if self.dispatcher:
+            # Fresh travel predictions for this order's scoring pass
+            self.dispatcher.begin_round()
+        
         # Use appropriate strategy
         if self.config.dispatcher_strategy == DispatcherStrategy.ZONE_OPTIMAL:
             best_asset = self._find_zone_optimal_asset(order)
@@ -272,8 +307,8 @@ class SimulationEngine:
         
         if best_asset and self.dispatcher:
             # Calculate delivery details
-            eta, predicted_hole = self.dispatcher.calculate_eta_and_destination(
-                best_asset, order.hole_number
+            eta, predicted_hole, _ = self.dispatcher.calculate_eta_and_destination(
+                best_asset, order
             )
             
             # Update order and asset
@@ -314,7 +349,7 @@ class SimulationEngine:
             return None
         
         # Prioritize assets already in the same zone
-        order_on_front = order.hole_number in self.config.front_9_holes
+        order_on_front = order.hole_number in self._front9
         
         zone_assets = []
         other_assets = []
@@ -326,7 +361,7 @@ class SimulationEngine:
                     zone_assets.append(asset)
             else:
                 # Staff can go anywhere but check current location
-                staff_on_front = asset.current_location in self.config.front_9_holes
+                staff_on_front = asset.current_location in self._front9
                 if (order_on_front and staff_on_front) or \
                    (not order_on_front and not staff_on_front):
                     zone_assets.append(asset)
@@ -342,7 +377,7 @@ class SimulationEngine:
             best_eta = float('inf')
             
             for asset in candidates:
-                eta, _ = self.dispatcher.calculate_eta_and_destination(asset, order.hole_number)
+                eta, _, _ = self.dispatcher.calculate_eta_and_destination(asset, order)
                 if eta < best_eta:
                     best_eta = eta
                     best_asset = asset
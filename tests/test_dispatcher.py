@@ -1,10 +1,18 @@
 """
 Tests for the dispatcher module
 """
+import math
+import random
+
+import numpy as np
 import pytest
 from unittest.mock import patch, MagicMock
 from src.models import BeverageCart, DeliveryStaff, Order, AssetStatus, OrderStatus
-from src.dispatcher import Dispatcher
+from src.dispatcher import Dispatcher, _auction_assignment
+from src.dispatcher_strategies import (
+    SimpleDispatcher, solve_holes_advanced,
+    PREP_TIME_MIN, PLAYER_MIN_PER_HOLE, TRAVEL_TIME_PER_HOLE,
+)
 
 
 class TestDispatcher:
@@ -46,6 +54,30 @@ class TestDispatcher:
         assert predicted_hole >= 4  # Player should have advanced based on ETA
         assert prep_time == 10.0  # Mocked prep time
     
+    def test_begin_round_draws_fresh_travel_times(self, dispatcher, sample_assets):
+        """Test that travel predictions are reused within a round and redrawn after begin_round"""
+        asset = sample_assets[0]
+        order = Order(order_id="TEST_ROUND", hole_number=4)
+        predict_travel_time = dispatcher.prediction_service.predict_travel_time
+        
+        dispatcher.begin_round()
+        dispatcher.calculate_eta_and_destination(asset, order)
+        calls_per_round = predict_travel_time.call_count
+        dispatcher.calculate_eta_and_destination(asset, order)
+        assert predict_travel_time.call_count == calls_per_round
+        
+        dispatcher.begin_round()
+        dispatcher.calculate_eta_and_destination(asset, order)
+        assert predict_travel_time.call_count == 2 * calls_per_round
+    
+    def test_prep_cache_does_not_outlive_the_round(self, dispatcher, sample_assets):
+        """Test that prep estimates for orders handled outside the dispatcher are not kept"""
+        dispatcher.calculate_eta_and_destination(sample_assets[0], Order(order_id="TEST_PREP", hole_number=4))
+        
+        dispatcher.begin_round()
+        
+        assert dispatcher._prep_cache == {}
+    
     def test_find_best_candidate_front_nine(self, dispatcher):
         """Test finding best candidate for front nine order"""
         order = Order(order_id="TEST001", hole_number=5)
@@ -89,6 +121,15 @@ class TestDispatcher:
         assert assigned_asset is None
         assert order.status == OrderStatus.PENDING
     
+    @pytest.mark.parametrize("parallel", ["0", "1"])
+    def test_scoring_errors_propagate(self, dispatcher, monkeypatch, parallel):
+        """Test that a scoring error surfaces the same way with and without parallel scoring"""
+        monkeypatch.setenv("SWOOP_PARALLEL_SCORING", parallel)
+        dispatcher.prediction_service.predict_offer_acceptance_chance.side_effect = RuntimeError("model down")
+        
+        with pytest.raises(RuntimeError, match="model down"):
+            dispatcher.find_best_candidate(Order(order_id="TEST_ERR", hole_number=5))
+    
     def test_beverage_cart_preference(self, dispatcher):
         """Test that beverage carts are preferred when ETA is similar"""
         # Create a scenario where cart and staff have similar ETAs
@@ -131,4 +172,191 @@ class TestDispatcher:
         assigned_asset = dispatcher.dispatch_order(order)
         
         assert assigned_asset == cart1
-        assert assigned_asset.status == AssetStatus.EN_ROUTE_TO_PICKUP
\ No newline at end of file
+        assert assigned_asset.status == AssetStatus.EN_ROUTE_TO_PICKUP
+    
+    def test_find_best_candidate_sees_status_changes(self, dispatcher):
+        """Test that a status change made outside the dispatcher applies to the next search"""
+        order = Order(order_id="TEST010", hole_number=5)
+        first = dispatcher.find_best_candidate(order)
+        first['asset'].status = AssetStatus.INACTIVE
+        
+        second = dispatcher.find_best_candidate(order)
+        
+        assert second is not None
+        assert second['asset'] is not first['asset']
+    
+    def test_pending_orders_change_only_through_methods(self, dispatcher):
+        """Test that pending orders are a read-only snapshot managed by add/remove"""
+        order = Order(order_id="TEST012", hole_number=6)
+        dispatcher.add_pending_order(order)
+        
+        with pytest.raises(AttributeError):
+            dispatcher.pending_orders.append(order)
+        assert dispatcher.pending_orders == (order,)
+        
+        assert dispatcher.remove_pending_order(order) is True
+        assert dispatcher.remove_pending_order(order) is False
+        assert dispatcher.pending_orders == ()
+        # The hole index no longer offers the removed order for batching
+        batch = dispatcher.identify_batchable_orders(Order(order_id="TEST013", hole_number=6))
+        assert [o.order_id for o in batch] == ["TEST013"]
+    
+    @pytest.mark.parametrize("solver", ["hungarian", "auction"])
+    @patch('random.random', return_value=0.1)
+    def test_dispatch_pending_batch(self, mock_random, dispatcher, solver):
+        """Test that pending orders are assigned to distinct assets in one pass"""
+        if solver == "hungarian":
+            pytest.importorskip("scipy")
+        orders = [Order(order_id="TEST008", hole_number=3), Order(order_id="TEST009", hole_number=14)]
+        for order in orders:
+            dispatcher.add_pending_order(order)
+        
+        assigned = dispatcher.dispatch_pending_batch(solver=solver)
+        
+        assert len(assigned) == 2
+        assert len({asset.asset_id for _, asset in assigned}) == 2
+        # Equal ETAs from the mocked service, so the cart preference decides
+        assert {asset.asset_id for _, asset in assigned} == {"cart1", "cart2"}
+        assert all(order.status == OrderStatus.ASSIGNED for order in orders)
+        assert dispatcher.pending_orders == ()
+        assert dispatcher.last_batch_solver == solver
+    
+    @patch('random.random', return_value=0.1)
+    def test_dispatch_pending_batch_without_scipy(self, mock_random, dispatcher, caplog):
+        """Test that the Hungarian solver falls back to greedy with a warning when scipy is missing"""
+        dispatcher.add_pending_order(Order(order_id="TEST011", hole_number=3))
+        
+        with patch('src.dispatcher.linear_sum_assignment', None):
+            assigned = dispatcher.dispatch_pending_batch(solver="hungarian")
+        
+        assert len(assigned) == 1
+        assert dispatcher.last_batch_solver == "greedy"
+        assert "scipy is not installed" in caplog.text
+    
+    @patch('random.random', return_value=0.1)
+    def test_dispatch_pending_batch_auction_more_orders_than_eligible_assets(self, mock_random, dispatcher):
+        """Test that the auction finishes when some orders cannot all be placed"""
+        fleet = [
+            BeverageCart(asset_id="cart1", name="Cart 1", loop="front_9", current_location=3),
+            BeverageCart(asset_id="cart2", name="Cart 2", loop="back_9", current_location=12),
+            DeliveryStaff(asset_id="staff1", name="Staff 1", current_location="clubhouse"),
+        ]
+        fleet_dispatcher = Dispatcher(fleet)
+        fleet_dispatcher.prediction_service = dispatcher.prediction_service
+        for hole in (2, 3, 4):
+            fleet_dispatcher.add_pending_order(Order(order_id=f"TEST_AUCTION_{hole}", hole_number=hole))
+        
+        assigned = fleet_dispatcher.dispatch_pending_batch(solver="auction")
+        
+        # Only the front-nine cart and the staff member can reach holes 2-4
+        assert {asset.asset_id for _, asset in assigned} == {"cart1", "staff1"}
+        assert len(fleet_dispatcher.pending_orders) == 1
+    
+    def test_auction_assignment_with_ineligible_pairs(self):
+        """Test that the auction places as many rows as possible when pairs are ineligible"""
+        inf = float("inf")
+        cost = np.array([[inf, inf, 42, 34],
+                         [inf, inf, 31, 19],
+                         [14, inf, inf, 42],
+                         [25, inf, inf, 57]])
+        
+        rows, cols = _auction_assignment(cost)
+        
+        assert len(rows) == 3
+        assert len(set(cols)) == 3
+        assert cost[rows, cols].sum() == 42 + 19 + 14
+
+
+# Locations on either side of the front/back nine boundary, plus the ends of the course
+BOUNDARY_LOCATIONS = ["clubhouse", 1, 9, 10, 18]
+BOUNDARY_HOLES = [1, 9, 10, 18]
+
+
+def _location_number(location):
+    return 0 if location == "clubhouse" else location
+
+
+def _iterative_eta(prep_time, travel_to_pickup, travel_from_pickup, order_hole):
+    """The reference 3-iteration fixed-point loop for the ETA and delivery hole."""
+    predicted_hole = order_hole
+    final_eta = float('inf')
+    for _ in range(3):
+        total_eta = prep_time + travel_to_pickup + travel_from_pickup(predicted_hole)
+        new_predicted_hole = order_hole + math.floor(total_eta / PLAYER_MIN_PER_HOLE)
+        final_eta = total_eta
+        if new_predicted_hole == predicted_hole:
+            break
+        predicted_hole = new_predicted_hole
+    return final_eta, predicted_hole
+
+
+class TestEtaLoop:
+    """Pins the ETA calculations to the reference iterative loop"""
+    
+    @pytest.mark.parametrize("travel_per_hole", [0.5, TRAVEL_TIME_PER_HOLE, 3.0, 7.5])
+    def test_solve_holes_advanced_matches_fixed_point(self, travel_per_hole):
+        """Test that the solve is the smallest k with k == floor((base + k * T) / P)"""
+        for base_eta in np.arange(0.0, 120.0, 0.25):
+            expected = next(k for k in range(100)
+                            if k == math.floor((base_eta + k * travel_per_hole) / PLAYER_MIN_PER_HOLE))
+            assert solve_holes_advanced(base_eta, travel_per_hole) == expected
+    
+    @pytest.mark.parametrize("location", BOUNDARY_LOCATIONS)
+    @pytest.mark.parametrize("order_hole", BOUNDARY_HOLES)
+    def test_simple_dispatcher_eta_matches_loop(self, location, order_hole):
+        """Test SimpleDispatcher's table/closed-form ETA against the loop"""
+        asset = DeliveryStaff(asset_id="staff", name="Staff", current_location=location)
+        expected = _iterative_eta(
+            PREP_TIME_MIN,
+            _location_number(location) * TRAVEL_TIME_PER_HOLE,
+            lambda hole: abs(hole) * TRAVEL_TIME_PER_HOLE,
+            order_hole,
+        )
+        
+        assert SimpleDispatcher([asset]).calculate_eta_and_destination(asset, order_hole) == expected
+    
+    @pytest.mark.parametrize("time_of_day", ["morning", "noon", "afternoon"])
+    @pytest.mark.parametrize("location", BOUNDARY_LOCATIONS)
+    @pytest.mark.parametrize("order_hole", BOUNDARY_HOLES)
+    @patch('random.uniform', return_value=1.0)  # No random variation in the travel model
+    def test_dispatcher_eta_matches_loop(self, mock_uniform, order_hole, location, time_of_day):
+        """Test Dispatcher's ETA against the loop over the real travel model"""
+        asset = DeliveryStaff(asset_id="staff", name="Staff", current_location=location)
+        order = Order(order_id="TEST_LOOP", hole_number=order_hole, time_of_day=time_of_day)
+        dispatcher = Dispatcher([asset])
+        service = dispatcher.prediction_service
+        prep_time = service.predict_order_prep_time(order)  # No items, so the fixed default
+        expected = _iterative_eta(
+            prep_time,
+            service.predict_travel_time(location, 'clubhouse', time_of_day),
+            lambda hole: service.predict_travel_time('clubhouse', hole, time_of_day),
+            order_hole,
+        )
+        
+        eta, predicted_hole, _ = dispatcher.calculate_eta_and_destination(asset, order)
+        
+        assert (eta, predicted_hole) == pytest.approx(expected)
+    
+    @pytest.mark.parametrize("seed", range(20))
+    def test_dispatcher_eta_matches_loop_with_noise(self, seed):
+        """Test Dispatcher's ETA against the loop with the travel model's noise left on"""
+        random.seed(seed)
+        assets = [DeliveryStaff(asset_id=f"staff_{loc}", name="Staff", current_location=loc)
+                  for loc in BOUNDARY_LOCATIONS]
+        dispatcher = Dispatcher(assets)
+        dispatcher.begin_round()
+        
+        for order_hole in range(1, 19):
+            for time_of_day in ["morning", "noon", "afternoon"]:
+                order = Order(order_id=f"TEST_{order_hole}", hole_number=order_hole, time_of_day=time_of_day)
+                for asset in assets:
+                    eta, predicted_hole, prep_time = dispatcher.calculate_eta_and_destination(asset, order)
+                    # Same round, so the loop sees the same noisy draws the dispatcher did
+                    expected = _iterative_eta(
+                        prep_time,
+                        dispatcher._tt(asset.current_location, 'clubhouse', time_of_day),
+                        lambda hole: dispatcher._tt('clubhouse', hole, time_of_day),
+                        order_hole,
+                    )
+                    
+                    assert (eta, predicted_hole) == expected
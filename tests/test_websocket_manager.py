@@ -0,0 +1,77 @@
+"""
+Tests for the WebSocket broadcast buffer
+"""
+import asyncio
+import json
+
+from src.api.websocket_manager import BroadcastBuffer, ConnectionManager
+
+
+class FakeWebSocket:
+    """Records the text frames a client would receive"""
+    
+    def __init__(self):
+        self.scope = {"subprotocols": []}
+        self.frames = []
+    
+    async def accept(self, subprotocol=None):
+        pass
+    
+    async def send_text(self, data):
+        self.frames.append(json.loads(data))
+
+
+async def _connected_buffer():
+    manager = ConnectionManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket)
+    return manager, websocket, BroadcastBuffer(manager, window=0.01)
+
+
+class TestBroadcastBuffer:
+    """Test cases for coalescing events into WebSocket frames"""
+    
+    def test_events_in_window_share_one_batch_frame(self):
+        """Test that events emitted within the window go out as one batch frame"""
+        async def scenario():
+            manager, websocket, buffer = await _connected_buffer()
+            buffer.emit({"type": "new_order", "order_id": "ORD0001"})
+            buffer.emit({"type": "asset_update", "asset_id": "cart1"})
+            await asyncio.sleep(0.05)
+            manager.disconnect(websocket)
+            return websocket.frames
+        
+        assert asyncio.run(scenario()) == [{
+            "type": "batch",
+            "events": [
+                {"type": "new_order", "order_id": "ORD0001"},
+                {"type": "asset_update", "asset_id": "cart1"},
+            ],
+        }]
+    
+    def test_single_event_is_sent_unwrapped(self):
+        """Test that a lone event keeps its own frame format"""
+        async def scenario():
+            manager, websocket, buffer = await _connected_buffer()
+            buffer.emit({"type": "new_order", "order_id": "ORD0002"})
+            await asyncio.sleep(0.05)
+            manager.disconnect(websocket)
+            return websocket.frames
+        
+        assert asyncio.run(scenario()) == [{"type": "new_order", "order_id": "ORD0002"}]
+    
+    def test_close_flushes_pending_events(self):
+        """Test that shutting down sends pending events at once and only once"""
+        async def scenario():
+            manager, websocket, buffer = await _connected_buffer()
+            buffer.emit({"type": "new_order", "order_id": "ORD0003"})
+            await buffer.close()
+            await asyncio.sleep(0)  # Let the client's writer send the queued frame
+            sent_on_close = list(websocket.frames)
+            await asyncio.sleep(0.05)  # The cancelled window must not send it again
+            manager.disconnect(websocket)
+            return sent_on_close, websocket.frames
+        
+        sent_on_close, frames = asyncio.run(scenario())
+        assert sent_on_close == [{"type": "new_order", "order_id": "ORD0003"}]
+        assert frames == sent_on_close